@@ -0,0 +1,299 @@
+"""Benchmark every part (and the alternate versions) against a saved baseline
+
+    pipenv run python bench.py                 # everything with an input file
+    pipenv run python bench.py 12 16 -r 10     # just some days, more samples
+    pipenv run python bench.py --save-baseline # make this run the new baseline
+    pipenv run python bench.py 17 --sizes 25 50 100 200  # generated inputs
+
+Every run is appended to the history file. If any part's median gets slower
+than the baseline by more than the threshold, or a part raises (or is in the
+baseline but didn't run at all), we exit non-zero.
+
+With --sizes, each day runs on generated inputs of those sizes instead, and
+we report how fast the runtime grows with the size (1 = linear, 2 =
+quadratic, ...) so blowups show up before the real inputs get that big.
+"""
+
+import argparse
+import importlib
+import json
+import math
+import statistics
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from generators import GENERATORS
+from inputs import input_path, load_input
+from runner import PREPARE_INPUT, available_days, parts_for_day, quietly
+
+HISTORY_FILE = Path("bench_history.json")
+
+
+def day12_valid_combos(puzzle: str) -> int:
+    """part 1 of day 12, the brute force way"""
+    day12 = importlib.import_module("day12")
+    return sum(
+        day12.valid_combos(survey, combos)
+        for survey, combos in day12.parse_input(puzzle)
+    )
+
+
+# other ways of getting the same answers that we want to keep an eye on
+ALTERNATES: dict[int, dict[str, Callable[[str], object] | str]] = {
+    1: {"part2_alt": "part2_alt"},
+    2: {"regex_version": "regex_version"},
+    12: {"valid_combos": day12_valid_combos},
+    19: {"part1_batch": "part1_batch"},
+}
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[], object]
+
+
+def collect_benchmarks(days: list[int], puzzles: dict[int, str]) -> list[Benchmark]:
+    """Build a zero-argument callable for everything we want to time"""
+    benchmarks = []
+    for day in days:
+        module = importlib.import_module(f"day{day:02}")
+        puzzle = puzzles[day]
+        for part, (func_name, args) in parts_for_day(day).items():
+            benchmarks.append(
+                Benchmark(
+                    f"day{day:02}.{part}",
+                    partial(getattr(module, func_name), puzzle, *args),
+                )
+            )
+        for name, func in ALTERNATES.get(day, {}).items():
+            if isinstance(func, str):
+                func = getattr(module, func)
+            benchmarks.append(Benchmark(f"day{day:02}.{name}", partial(func, puzzle)))
+    return benchmarks
+
+
+def time_benchmark(benchmark: Benchmark, warmup: int, repeats: int) -> list[float]:
+    """Run the benchmark a few times to warm up, then collect samples"""
+    samples = []
+    with quietly():
+        for _ in range(warmup):
+            benchmark.func()
+        for _ in range(repeats):
+            start = perf_counter()
+            benchmark.func()
+            samples.append(perf_counter() - start)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    if len(samples) > 1:
+        p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1]
+    else:
+        p95 = samples[0]
+    return {
+        "median": statistics.median(samples),
+        "p95": p95,
+        "samples": len(samples),
+    }
+
+
+def load_history(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {"baseline": {}, "runs": []}
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Which benchmarks got slower than the baseline allows?"""
+    regressions = []
+    for name, result in results.items():
+        try:
+            old_median = baseline[name]["median"]
+        except KeyError:
+            continue
+        if result["median"] > old_median * (1 + threshold):
+            regressions.append(
+                f"{name}: {result['median']:.4f}s vs baseline {old_median:.4f}s"
+                f" ({result['median'] / old_median - 1:+.0%})"
+            )
+    return regressions
+
+
+def find_missing(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    days: list[int],
+) -> list[str]:
+    """Which of these days' baseline benchmarks have no result this time?
+
+    A part that crashes, or got renamed or dropped, would otherwise never be
+    compared against the baseline at all.
+    """
+    prefixes = {f"day{day:02}." for day in days}
+    return [
+        name
+        for name in baseline
+        if name[: len("dayXX.")] in prefixes and name not in results
+    ]
+
+
+def growth_exponents(timings: list[tuple[int, float]]) -> list[float]:
+    """Slope of log(time) vs log(size) between each pair of sizes"""
+    return [
+        math.log(time2 / time1) / math.log(size2 / size1)
+        for (size1, time1), (size2, time2) in zip(timings, timings[1:])
+    ]
+
+
+def run_scaling(
+    days: list[int],
+    sizes: list[int],
+    warmup: int,
+    repeats: int,
+    seed: int,
+) -> tuple[dict[str, list[tuple[int, float]]], list[str]]:
+    """Time every part on generated inputs of each size
+
+    Also returns the error for every run that raised instead of finishing.
+    """
+    timings: dict[str, list[tuple[int, float]]] = {}
+    failures: list[str] = []
+    for size in sizes:
+        puzzles = {day: GENERATORS[day](size, seed=seed) for day in days}
+        for benchmark in collect_benchmarks(days, puzzles):
+            try:
+                samples = time_benchmark(benchmark, warmup, repeats)
+            except Exception as exc:
+                failures.append(
+                    f"{benchmark.name} @ {size}: error {exc.__class__.__name__}: {exc}"
+                )
+                print(failures[-1])
+                continue
+            median = statistics.median(samples)
+            timings.setdefault(benchmark.name, []).append((size, median))
+            print(f"{benchmark.name} @ {size}: median {median:.4f}s")
+    return timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown vs the baseline median (0.2 = 20%%)",
+    )
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", help="run on generated inputs of these sizes"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--max-exponent",
+        type=float,
+        help="with --sizes, fail if runtime grows faster than size ** this",
+    )
+    args = parser.parse_args()
+
+    if args.sizes:
+        days = [day for day in args.days or available_days() if day in GENERATORS]
+        timings, failures = run_scaling(
+            days, sorted(args.sizes), args.warmup, args.repeats, args.seed
+        )
+        history = load_history(args.history)
+        history.setdefault("scaling", []).append(
+            {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "seed": args.seed,
+                "timings": timings,
+            }
+        )
+        args.history.write_text(json.dumps(history, indent=2))
+        print("--- growth (1 = linear in size, 2 = quadratic, ...):")
+        too_fast = []
+        for name, points in timings.items():
+            exponents = growth_exponents(points)
+            print(f"{name}: {' '.join(f'{i:.2f}' for i in exponents)}")
+            if args.max_exponent is not None and any(
+                exponent > args.max_exponent for exponent in exponents
+            ):
+                too_fast.append(name)
+        if too_fast:
+            print(
+                f"growing faster than size ** {args.max_exponent}: {', '.join(too_fast)}"
+            )
+        if failures:
+            print("--- failed:")
+            print("\n".join(failures))
+        if too_fast or failures:
+            sys.exit(1)
+        return
+
+    days = args.days or [day for day in available_days() if input_path(day).exists()]
+    puzzles = {}
+    for day in days:
+        puzzles[day] = load_input(day)
+        if day in PREPARE_INPUT:
+            puzzles[day] = PREPARE_INPUT[day](puzzles[day])
+
+    results = {}
+    failures = []
+    for benchmark in collect_benchmarks(days, puzzles):
+        try:
+            samples = time_benchmark(benchmark, args.warmup, args.repeats)
+        except Exception as exc:
+            failures.append(f"{benchmark.name}: error {exc.__class__.__name__}: {exc}")
+            print(failures[-1])
+            continue
+        results[benchmark.name] = summarize(samples)
+        print(
+            f"{benchmark.name}: median {results[benchmark.name]['median']:.4f}s,"
+            f" p95 {results[benchmark.name]['p95']:.4f}s"
+        )
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history["baseline"], args.threshold)
+    if not args.save_baseline:
+        failures += [
+            f"{name}: in the baseline but didn't run"
+            for name in find_missing(results, history["baseline"], days)
+            if not any(failure.startswith(f"{name}:") for failure in failures)
+        ]
+    history["runs"].append(
+        {"timestamp": datetime.now().isoformat(timespec="seconds"), "results": results}
+    )
+    if args.save_baseline or not history["baseline"]:
+        history["baseline"] = results
+    else:
+        # anything we haven't seen before becomes part of the baseline
+        history["baseline"] = results | history["baseline"]
+    args.history.write_text(json.dumps(history, indent=2))
+
+    if regressions and not args.save_baseline:
+        print("--- slower than the baseline:")
+        print("\n".join(regressions))
+    if failures:
+        print("--- failed:")
+        print("\n".join(failures))
+    if failures or (regressions and not args.save_baseline):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
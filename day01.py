@@ -1,5 +1,9 @@
 import re
-from pathlib import Path
+from collections import deque
+from collections.abc import Iterable
+
+from inputs import iter_lines, load_input
+from parallel import map_reduce
 
 TEST_INPUT = """1abc2
 pqr3stu8vwx
@@ -15,18 +19,117 @@ zoneight234
 7pqrstsixteen"""
 
 
-def part1(puzzle_input: str) -> int:
-    lines = [line.strip() for line in puzzle_input.splitlines()]
-    total = 0
-    for line in lines:
-        digits = [int(char) for char in line if char.isdigit()]
-        value = digits[0] * 10 + digits[-1]
-        # print(line, value)
-        total += value
-    return total
+NUMERALS = {str(i): i for i in range(1, 10)}
+SPELLED = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+}
+NEWLINE = ord("\n")
+
+
+class DigitScanner:
+    """Finds digits (however they're written) in one pass over the bytes
+
+    This is an Aho-Corasick automaton turned into a full state table: for
+    every state and every byte there's a next state, and each state knows
+    which digit (if any) has just finished. So scanning is one table lookup
+    per byte, overlaps like "eightwo" come out as both digits, and there's
+    nothing to allocate per line.
+    """
+
+    def __init__(self, words: dict[str, int]):
+        # the trie of all the words
+        children: list[dict[int, int]] = [{}]
+        self.digits = [0]
+        for word, value in words.items():
+            state = 0
+            for byte in word.encode():
+                if byte not in children[state]:
+                    children[state][byte] = len(children)
+                    children.append({})
+                    self.digits.append(0)
+                state = children[state][byte]
+            self.digits[state] = value
+        # then fill in where every miss goes, shallowest states first
+        self.table = [0] * (len(children) * 256)
+        fallback = [0] * len(children)
+        queue = deque()
+        for byte, child in children[0].items():
+            self.table[byte] = child
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            if not self.digits[state]:
+                self.digits[state] = self.digits[fallback[state]]
+            for byte in range(256):
+                child = children[state].get(byte)
+                if child is None:
+                    miss = self.table[fallback[state] << 8 | byte]
+                    self.table[state << 8 | byte] = miss
+                else:
+                    fallback[child] = self.table[fallback[state] << 8 | byte]
+                    self.table[state << 8 | byte] = child
+                    queue.append(child)
+
+    def find_all(self, line: str | bytes | memoryview) -> list[int]:
+        """Every digit in the line, in order"""
+        if isinstance(line, str):
+            line = line.encode()
+        table = self.table
+        digits = self.digits
+        found = []
+        state = 0
+        for byte in line:
+            state = table[state << 8 | byte]
+            if digits[state]:
+                found.append(digits[state])
+        return found
+
+    def total(self, data: str | bytes | memoryview) -> int:
+        """Add up first digit * 10 + last digit for every line in data"""
+        if isinstance(data, str):
+            data = data.encode()
+        table = self.table
+        digits = self.digits
+        total = 0
+        first = last = 0
+        state = 0
+        for byte in data:
+            if byte == NEWLINE:
+                total += first * 10 + last
+                first = last = 0
+                state = 0
+                continue
+            state = table[state << 8 | byte]
+            if digits[state]:
+                last = digits[state]
+                if not first:
+                    first = last
+        return total + first * 10 + last
+
+
+NUMERAL_SCANNER = DigitScanner(NUMERALS)
+DIGIT_SCANNER = DigitScanner(NUMERALS | SPELLED)
 
 
-def part2_alt(puzzle_input: str) -> int:
+def scanner_total(scanner: DigitScanner, puzzle_input: str | Iterable[str]) -> int:
+    if isinstance(puzzle_input, (str, bytes, memoryview)):
+        return scanner.total(puzzle_input)
+    return sum(scanner.total(line) for line in iter_lines(puzzle_input))
+
+
+def part1(puzzle_input: str | Iterable[str]) -> int:
+    return scanner_total(NUMERAL_SCANNER, puzzle_input)
+
+
+def part2_alt(puzzle_input: str | Iterable[str]) -> int:
     values = {
         "one": 1,
         "two": 2,
@@ -41,7 +144,7 @@ def part2_alt(puzzle_input: str) -> int:
     regex = re.compile(rf'({"|".join(values)})')
     reversed_regex = re.compile(rf'({"|".join(i[::-1] for i in values)})')
     total = 0
-    for line in puzzle_input.splitlines():
+    for line in iter_lines(puzzle_input):
         first_digit = values[regex.search(line).group(0)]
         last_digit = values[reversed_regex.search(line[::-1]).group(0)[::-1]]
         score = first_digit * 10 + last_digit
@@ -49,54 +152,21 @@ def part2_alt(puzzle_input: str) -> int:
     return total
 
 
-def part2(puzzle_input: str) -> int:
-    lines = [line.strip() for line in puzzle_input.splitlines()]
-    total = 0
-    for line in lines:
-        digits = digits_in_line(line)
-
-        value = digits[0] * 10 + digits[-1]
-        # print(line, value)
-        total += value
-    return total
+def part2(puzzle_input: str | Iterable[str], workers: int | None = None) -> int:
+    if workers:
+        return map_reduce(part2, puzzle_input, workers)
+    return scanner_total(DIGIT_SCANNER, puzzle_input)
 
 
-def digits_in_line(line: str) -> list[int]:
-    values = {
-        "one": 1,
-        "two": 2,
-        "three": 3,
-        "four": 4,
-        "five": 5,
-        "six": 6,
-        "seven": 7,
-        "eight": 8,
-        "nine": 9,
-    } | {str(i): i for i in range(1, 10)}
-    first_chars = {char[0] for char in values}
-    digits = []
-    for index, char in enumerate(line):
-        if char in first_chars:
-            # print(char, line[index : index + 5])
-            if char.isdigit():
-                digits.append(int(char))
-                continue
-            for offset in range(3, 6):
-                try:
-                    value = values[line[index : index + offset]]
-                except KeyError:
-                    pass
-                else:
-                    digits.append(value)
-                    break
-    return digits
+def digits_in_line(line: str | bytes | memoryview) -> list[int]:
+    return DIGIT_SCANNER.find_all(line)
 
 
 def main():
     test_value = 142
     assert part1(TEST_INPUT) == test_value, part1(TEST_INPUT)
 
-    real_input = Path("day01.txt").read_text()
+    real_input = load_input(1)
     print(part1(real_input))
     part_2_result = part2(PART_2_TEST_INPUT)
     assert part_2_result == 281, part_2_result
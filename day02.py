@@ -1,8 +1,9 @@
 """day 2: cube conundrum"""
 import re
-from pathlib import Path
+from collections.abc import Iterable
 
-REAL_INPUT = Path("day02.txt").read_text()
+from inputs import iter_lines, load_input
+from parallel import add_elementwise, map_reduce
 
 TEST_CONDITION = {
     "red": 12,
@@ -19,10 +20,15 @@ Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green"""
 DRAW_REGEX = re.compile(r"(\d+) (red|green|blue)")
 
 
-def regex_version(puzzle_input: str) -> tuple[int, int]:
+def regex_version(
+    puzzle_input: str | Iterable[str],
+    workers: int | None = None,
+) -> tuple[int, int]:
+    if workers:
+        return map_reduce(regex_version, puzzle_input, workers, add_elementwise)
     part1_score = 0
     part2_score = 0
-    for line in puzzle_input.splitlines():
+    for line in iter_lines(puzzle_input):
         game_info, game_data = line.split(": ")
         game_number = int(game_info.split()[1])
         possible = True
@@ -45,9 +51,12 @@ def regex_version(puzzle_input: str) -> tuple[int, int]:
     return part1_score, part2_score
 
 
-def part1(puzzle_input: str, conditions: dict[str, int]) -> int:
+def part1(
+    puzzle_input: str | Iterable[str],
+    conditions: dict[str, int] = TEST_CONDITION,
+) -> int:
     total = 0
-    for line in puzzle_input.splitlines():
+    for line in iter_lines(puzzle_input):
         game_info, game_data = line.split(": ")
         game_number = int(game_info.split()[1])
         possible = True
@@ -67,10 +76,10 @@ def part1(puzzle_input: str, conditions: dict[str, int]) -> int:
     return total
 
 
-def part2(puzzle_input: str) -> int:
+def part2(puzzle_input: str | Iterable[str]) -> int:
     """find the total power for the games"""
     total = 0
-    for line in puzzle_input.splitlines():
+    for line in iter_lines(puzzle_input):
         _, game_data = line.split(": ")
         power = 0
         score = {
@@ -89,13 +98,14 @@ def part2(puzzle_input: str) -> int:
 
 
 def main():
+    real_input = load_input(2)
     part_1_result = part1(TEST_INPUT, TEST_CONDITION)
     assert part_1_result == 8, part_1_result
-    part_1_real = part1(REAL_INPUT, TEST_CONDITION)
+    part_1_real = part1(real_input, TEST_CONDITION)
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 2286, part_2_result
-    part_2_real = part2(REAL_INPUT)
-    part_1_alt, part_2_alt = regex_version(REAL_INPUT)
+    part_2_real = part2(real_input)
+    part_1_alt, part_2_alt = regex_version(real_input)
     assert part_1_real == part_1_alt, (part_1_real, part_1_alt)
     assert part_2_real == part_2_alt, (part_2_real, part_2_alt)
     print(part_1_real)
@@ -1,6 +1,7 @@
 """Day 3: gear ratios"""
 
-from pathlib import Path
+from grid import Grid
+from inputs import load_input
 
 TEST_INPUT = """467..114..
 ...*......
@@ -13,174 +14,103 @@ TEST_INPUT = """467..114..
 ...$.*....
 .664.598.."""
 
-REAL_INPUT = Path("day03.txt").read_text()
-
-GridType = dict[tuple[int, int], str]
-
-
-def parse_input(puzzle_input: str) -> GridType:
-    grid = {}
-    for y, line in enumerate(puzzle_input.splitlines()):
-        for x, char in enumerate(line):
-            if char == ".":
-                continue
-            grid[x, y] = char
-    return grid
-
-
-def adjacent_to_symbol(x: int, y: int, grid: GridType) -> bool:
-    """Are any characters adjacent to me a non-digit?"""
-    neighbors = [
-        # up
-        (x, y - 1),
-        # down
-        (x, y + 1),
-        # left
-        (x - 1, y),
-        # up and left
-        (x - 1, y - 1),
-        # down and left
-        (x - 1, y + 1),
-    ]
-    try:
-        if grid[x, y].isdigit():
-            # only look to the right if the active char is a digit
-            neighbors.extend(
-                [
-                    # right
-                    (x + 1, y),
-                    # up and right
-                    (x + 1, y - 1),
-                    # down and right
-                    (x + 1, y + 1),
-                ]
-            )
-    except KeyError:
-        pass
-    for neighbor in neighbors:
-        try:
-            if not grid[neighbor].isdigit():
+DOT = ord(".")
+GEAR = ord("*")
+
+
+def parse_input(puzzle_input: str) -> Grid:
+    return Grid.from_text(puzzle_input)
+
+
+def is_digit(value: int | None) -> bool:
+    return value is not None and 48 <= value <= 57
+
+
+def is_symbol(value: int | None) -> bool:
+    return value is not None and value != DOT and not is_digit(value)
+
+
+def adjacent_to_symbol(x_start: int, x_end: int, y: int, grid: Grid) -> bool:
+    """Is anything in the box around x_start..x_end on row y a symbol?"""
+    for y1 in range(y - 1, y + 2):
+        for x1 in range(x_start - 1, x_end + 1):
+            if is_symbol(grid.get(x1, y1)):
                 return True
-        except KeyError:
-            pass
     return False
 
 
-def part_numbers_on_row(y: int, max_x: int, grid: GridType) -> list[int]:
-    """find all the numbers on the row which are adjacent to a non-digit"""
-    running_total = 0
+def numbers_on_row(y: int, grid: Grid) -> list[tuple[int, int, int]]:
+    """find all the numbers on the row as (start x, end x, value)"""
+    row = grid.row(y)
     result = []
-    is_part_number = False
-    for x in range(max_x + 1):
-        try:
-            val = int(grid[x, y])
-        except (KeyError, ValueError):
-            if running_total:
-                # we've reached the end of a number:
-                if not is_part_number:
-                    if adjacent_to_symbol(x, y, grid=grid):
-                        is_part_number = True
-                if is_part_number:
-                    result.append(running_total)
-            running_total = 0
-            is_part_number = False
-        else:
-            running_total = 10 * running_total + val
-            if not is_part_number:
-                if adjacent_to_symbol(x, y, grid=grid):
-                    is_part_number = True
+    x = 0
+    while x < grid.width:
+        if not is_digit(row[x]):
+            x += 1
+            continue
+        x_start = x
+        value = 0
+        while x < grid.width and is_digit(row[x]):
+            value = 10 * value + row[x] - 48
+            x += 1
+        result.append((x_start, x, value))
     return result
 
 
+def part_numbers_on_row(y: int, grid: Grid) -> list[int]:
+    """find all the numbers on the row which are adjacent to a symbol"""
+    return [
+        value
+        for x_start, x_end, value in numbers_on_row(y, grid)
+        if adjacent_to_symbol(x_start, x_end, y, grid)
+    ]
+
+
 def part1(puzzle_input: str) -> int:
     grid = parse_input(puzzle_input)
-    min_y = 0
-    max_y = max(y for _, y in grid)
-    max_x = max(x for x, _ in grid) + 1
     score = 0
-    for row in range(min_y, max_y + 1):
-        part_numbers = part_numbers_on_row(row, max_x, grid)
+    for row in range(grid.height):
+        part_numbers = part_numbers_on_row(row, grid)
         # print(row, part_numbers)
         score += sum(part_numbers)
     return score
 
 
-def find_number_adjacent_to_coordinate(x: int, y: int, grid: GridType) -> int:
-    # start going left until we find a not-digit or gap
-    min_x = 100000
-    for x1 in range(x, -1, -1):
-        if grid.get((x1, y), "").isdigit():
-            min_x = x1
-        else:
-            break
-    max_x = -1
-    # my grid is 140 wide
-    for x1 in range(x, 150):
-        if grid.get((x1, y), "".isdigit()):
-            max_x = x1
-        else:
-            break
-
+def find_number_adjacent_to_coordinate(x: int, y: int, grid: Grid) -> tuple[int, int]:
+    """Find the number with a digit at (x, y) as (start x, value)"""
+    row = grid.row(y)
+    # start going left until we find a not-digit or the edge
+    while x > 0 and is_digit(row[x - 1]):
+        x -= 1
+    x_start = x
     running_total = 0
-    for x1 in range(min_x, max_x + 1):
-        try:
-            running_total = running_total * 10 + int(grid[x1, y])
-        except ValueError:
-            if grid[x1, y] == "*":
-                break
-            raise
-    return running_total
+    while x < grid.width and is_digit(row[x]):
+        running_total = running_total * 10 + row[x] - 48
+        x += 1
+    return x_start, running_total
 
 
-def adjacent_numbers_to_coordinate(
-    x: int, y: int, max_x: int, grid: GridType
-) -> set[int]:
+def adjacent_numbers_to_coordinate(x: int, y: int, grid: Grid) -> list[int]:
     """
     Find all numbers adjacent to the given coordinate.
 
     There _should_ be exactly two, but that's up to the caller to handle.
     """
-    # start looking up
-    y1 = y - 1
-    found_numbers = set()
-    for x1 in range(x - 1, x + 2):
-        if grid.get((x1, y1), "").isdigit():
-            adjacent_number = find_number_adjacent_to_coordinate(x1, y1, grid)
-            if adjacent_number:
-                found_numbers.add(adjacent_number)
-    # now down
-    y1 = y + 1
-    for x1 in range(x - 1, x + 2):
-        if grid.get((x1, y1), "").isdigit():
-            adjacent_number = find_number_adjacent_to_coordinate(x1, y1, grid)
-            if adjacent_number:
-                found_numbers.add(adjacent_number)
-    # now left
-    if grid.get((x - 1, y), "").isdigit():
-        if (x, y) == (58, 3):
-            print("left:", grid[x - 1, y])
-        adjacent_number = find_number_adjacent_to_coordinate(x - 1, y, grid)
-        if adjacent_number:
-            found_numbers.add(adjacent_number)
-    # and right
-    if grid.get((x + 1, y), "").isdigit():
-        adjacent_number = find_number_adjacent_to_coordinate(x + 1, y, grid)
-        if adjacent_number:
-            found_numbers.add(adjacent_number)
-    # if len(found_numbers) == 2:
-    #     print(f"found gear at {x, y}: {found_numbers}")
-    return found_numbers
+    # key by where each number starts so we only count each one once, even
+    # if it touches the coordinate with more than one digit
+    found_numbers = {}
+    for x1, y1 in grid.neighbors(x, y, diagonal=True):
+        if is_digit(grid[x1, y1]):
+            x_start, value = find_number_adjacent_to_coordinate(x1, y1, grid)
+            found_numbers[x_start, y1] = value
+    return list(found_numbers.values())
 
 
 def part2(puzzle_input: str) -> int:
     grid = parse_input(puzzle_input)
-    max_x = max(x for x, _ in grid) + 1
-    gears = [coordinate for coordinate, value in grid.items() if value == "*"]
-    # print(gears)
     score = 0
-    for gear in gears:
-        x, y = gear
-        adjacents = adjacent_numbers_to_coordinate(x, y, max_x, grid)
+    for x, y in grid.positions(GEAR):
+        adjacents = adjacent_numbers_to_coordinate(x, y, grid)
         try:
             adjacent_1, adjacent_2 = adjacents
         except ValueError:
@@ -192,12 +122,13 @@ def part2(puzzle_input: str) -> int:
 
 
 def main():
+    real_input = load_input(3)
     test_result = part1(TEST_INPUT)
     assert test_result == 4361, test_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     test_result = part2(TEST_INPUT)
     assert test_result == 467835, test_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
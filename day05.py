@@ -1,11 +1,12 @@
 """Day 5: needlessly complicated almanacs"""
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
+from functools import reduce
 from itertools import batched
-from pathlib import Path
 
-from intervaltree import Interval, IntervalTree
+import numpy as np
 
-REAL_INPUT = Path("day05.txt").read_text()
+from inputs import load_input
 
 TEST_INPUT = """seeds: 79 14 55 13
 
@@ -43,26 +44,105 @@ humidity-to-location map:
 
 
 class Mapping:
-    def __init__(self, ranges: list[tuple[int, int, int]] | None = None):
-        self.ranges = ranges or []
+    """A piecewise-linear map from (non-negative) numbers to numbers
 
-    def add_range(
+    The number line is cut up at starts (sorted, always beginning with 0),
+    and anything from starts[i] up to starts[i + 1] gets offsets[i] added.
+    Anything an almanac doesn't mention maps to itself, which is just a
+    piece with an offset of 0.
+    """
+
+    def __init__(
         self,
-        source_start: int,
-        destination_start: int,
-        range_: int,
+        starts: list[int] | None = None,
+        offsets: list[int] | None = None,
     ):
-        self.ranges.append((source_start, destination_start, range_))
+        self.starts = starts or [0]
+        self.offsets = offsets or [0]
+
+    @classmethod
+    def from_ranges(cls, ranges: list[tuple[int, int, int]]) -> "Mapping":
+        """Build from the almanac's (source start, destination start, length)s"""
+        starts = []
+        offsets = []
+        end = 0
+        for source_start, destination_start, range_ in sorted(ranges):
+            if source_start > end:
+                # a gap that maps to itself
+                starts.append(end)
+                offsets.append(0)
+            starts.append(source_start)
+            offsets.append(destination_start - source_start)
+            end = source_start + range_
+        starts.append(end)
+        offsets.append(0)
+        return cls(*cls._tidy(starts, offsets))
+
+    @staticmethod
+    def _tidy(starts: list[int], offsets: list[int]) -> tuple[list[int], list[int]]:
+        """Drop empty pieces and merge neighbours that have the same offset"""
+        tidy_starts = []
+        tidy_offsets = []
+        for index, (start, offset) in enumerate(zip(starts, offsets)):
+            if index + 1 < len(starts) and starts[index + 1] == start:
+                continue
+            if tidy_offsets and tidy_offsets[-1] == offset:
+                continue
+            tidy_starts.append(start)
+            tidy_offsets.append(offset)
+        return tidy_starts, tidy_offsets
 
     def __getitem__(self, obj: int) -> int:
-        for source_start, dest_start, range_ in self.ranges:
-            if obj in range(source_start, source_start + range_):
-                offset = obj - source_start
-                return dest_start + offset
-        return obj
+        return obj + self.offsets[bisect_right(self.starts, obj) - 1]
+
+    def lookup(self, values: np.ndarray) -> np.ndarray:
+        """__getitem__ for a whole array of numbers at once"""
+        values = np.asarray(values, dtype=np.int64)
+        pieces = np.searchsorted(self.starts, values, side="right") - 1
+        return values + np.asarray(self.offsets, dtype=np.int64)[pieces]
+
+    def then(self, other: "Mapping") -> "Mapping":
+        """One mapping that does this one and then other"""
+        starts = []
+        offsets = []
+        ends = self.starts[1:] + [None]
+        for start, end, offset in zip(self.starts, ends, self.offsets):
+            # where this piece lands, cut up wherever other's pieces change
+            first = bisect_right(other.starts, start + offset) - 1
+            if end is None:
+                last = len(other.starts)
+            else:
+                last = bisect_left(other.starts, end + offset)
+            starts.append(start)
+            offsets.append(offset + other.offsets[first])
+            for index in range(first + 1, last):
+                starts.append(other.starts[index] - offset)
+                offsets.append(offset + other.offsets[index])
+        return Mapping(*self._tidy(starts, offsets))
+
+    def lowest_in_ranges(self, starts: np.ndarray, lengths: np.ndarray) -> int:
+        """The lowest number any of the ranges [start, start + length) maps to
+
+        Within a piece everything just shifts, so the lowest value is always
+        at the start of a range or at one of the cuts inside a range.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = starts + np.asarray(lengths, dtype=np.int64)
+        lowest = self.lookup(starts).min()
+        cuts = np.asarray(self.starts, dtype=np.int64)
+        # which cuts fall inside a range (the ranges might overlap)
+        order = np.argsort(starts)
+        sorted_starts = starts[order]
+        furthest_end = np.maximum.accumulate(ends[order])
+        before = np.searchsorted(sorted_starts, cuts, side="right") - 1
+        inside = (before >= 0) & (cuts < furthest_end[np.maximum(before, 0)])
+        if inside.any():
+            offsets = np.asarray(self.offsets, dtype=np.int64)
+            lowest = min(lowest, (cuts + offsets)[inside].min())
+        return int(lowest)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self.ranges})"
+        return f"{self.__class__.__name__}({self.starts}, {self.offsets})"
 
 
 @dataclass
@@ -76,6 +156,21 @@ class Garden:
     temperature_to_humidity: Mapping
     humidity_to_location: Mapping
 
+    def seed_to_location(self) -> Mapping:
+        """All seven maps squashed into one"""
+        return reduce(
+            Mapping.then,
+            [
+                self.seed_to_soil,
+                self.soil_to_fertilizer,
+                self.fertilizer_to_water,
+                self.water_to_light,
+                self.light_to_temperature,
+                self.temperature_to_humidity,
+                self.humidity_to_location,
+            ],
+        )
+
 
 def parse_input(puzzle_input: str) -> Garden:
     seed_line, *groups = puzzle_input.split("\n\n")
@@ -85,14 +180,15 @@ def parse_input(puzzle_input: str) -> Garden:
     for group in groups:
         header, *lines = group.splitlines()
         map_name = header.split()[0].replace("-", "_")
-        kwargs[map_name] = Mapping()
+        ranges = []
         for line in lines:
             (
                 destination_start,
                 source_start,
                 range_,
             ) = [int(i) for i in line.split()]
-            kwargs[map_name].add_range(source_start, destination_start, range_)
+            ranges.append((source_start, destination_start, range_))
+        kwargs[map_name] = Mapping.from_ranges(ranges)
     # print(kwargs)
     garden = Garden(**kwargs)
     return garden
@@ -108,68 +204,23 @@ def part1(puzzle_input: str):
                 soil,
                 garden.seed_to_soil[seed],
             )
-    min_location = 10_000_000_000
-
-    for seed in garden.seeds:
-        soil = garden.seed_to_soil[seed]
-        fertilizer = garden.soil_to_fertilizer[soil]
-        water = garden.fertilizer_to_water[fertilizer]
-        light = garden.water_to_light[water]
-        temperature = garden.light_to_temperature[light]
-        humidity = garden.temperature_to_humidity[temperature]
-        location = garden.humidity_to_location[humidity]
-        min_location = min(min_location, location)
-
-    return min_location
+    return int(garden.seed_to_location().lookup(garden.seeds).min())
 
 
 def part2(puzzle_input: str) -> int:
     garden = parse_input(puzzle_input)
-    seed_intervals = IntervalTree(
-        [
-            Interval(start, end + start)
-            for start, end in batched(
-                garden.seeds,
-                n=2,
-            )
-        ]
-    )
-    for mapping in [
-        garden.seed_to_soil,
-        garden.soil_to_fertilizer,
-        garden.fertilizer_to_water,
-        garden.water_to_light,
-        garden.light_to_temperature,
-        garden.temperature_to_humidity,
-        garden.humidity_to_location,
-    ]:
-        for source_start, dest_start, length in sorted(mapping.ranges):
-            seed_intervals.slice(source_start)
-            seed_intervals.slice(source_start + length)
-        new_seed_intervals = IntervalTree(
-            [
-                Interval(
-                    mapping[interval.begin],
-                    # we need to handle the off by one because
-                    # mapping[interval.end] is somewhere else
-                    # entirely
-                    mapping[interval.end - 1] + 1,
-                )
-                for interval in seed_intervals
-            ]
-        )
-        new_seed_intervals.merge_overlaps()
-        seed_intervals = new_seed_intervals
-    return sorted(seed_intervals)[0].begin
+    starts, lengths = zip(*batched(garden.seeds, n=2))
+    return garden.seed_to_location().lowest_in_ranges(starts, lengths)
 
 
 def main():
+    real_input = load_input(5)
     part_1_test = part1(TEST_INPUT)
     assert part_1_test == 35, part_1_test
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_test = part2(TEST_INPUT)
     assert part_2_test == 46, part_2_test
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
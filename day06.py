@@ -1,46 +1,72 @@
 """Day 6: a day at the (really short) boat races"""
 
-from pathlib import Path
+from math import isqrt, prod
+
+import numpy as np
+
+from inputs import load_input
 
 TEST_INPUT = """Time:      7  15   30
 Distance:  9  40  200"""
 
-REAL_INPUT = Path("day06.txt").read_text()
+
+def ways_to_win(time: int, distance: int) -> int:
+    """How many hold times beat the record
+
+    Holding for h goes h * (time - h), so we win between the two roots of
+    h^2 - time * h + distance = 0. isqrt keeps it exact for any size of race,
+    then it's just a matter of checking which side of the root we landed on.
+    """
+    discriminant = time * time - 4 * distance
+    if discriminant <= 0:
+        return 0
+    hold = (time - isqrt(discriminant) + 1) // 2
+    if hold * (time - hold) <= distance:
+        hold += 1
+    # it's symmetric, so we win from hold up to time - hold
+    return max(time - 2 * hold + 1, 0)
+
+
+def ways_to_win_many(times: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """ways_to_win for a whole array of races at once
+
+    Works in int64, so times need to stay below about 3 billion (time *
+    time has to fit).
+    """
+    times = np.asarray(times, dtype=np.int64)
+    distances = np.asarray(distances, dtype=np.int64)
+    discriminants = times * times - 4 * distances
+    roots = np.sqrt(np.maximum(discriminants, 0)).astype(np.int64)
+    # the float square root can be a touch off, nudge it to the exact one
+    roots -= roots * roots > discriminants
+    roots += (roots + 1) * (roots + 1) <= discriminants
+    holds = (times - roots + 1) // 2
+    holds += holds * (times - holds) <= distances
+    return np.where(discriminants > 0, np.maximum(times - 2 * holds + 1, 0), 0)
 
 
 def part1(puzzle_input: str) -> int:
-    score = 1
     time, distance = puzzle_input.splitlines()
     times = [int(i) for i in time.split(":")[1].split()]
     distances = [int(i) for i in distance.split(":")[1].split()]
-    for t, d in zip(times, distances):
-        possible_ways = sum(
-            int((t - hold_time) * hold_time > d) for hold_time in range(1, t)
-        )
-        score *= possible_ways
-    return score
+    return prod(ways_to_win(t, d) for t, d in zip(times, distances))
 
 
 def part2(puzzle_input: str) -> int:
-    score = 1
     time, distance = puzzle_input.splitlines()
     t = int(time.split(":")[1].replace(" ", ""))
     d = int(distance.split(":")[1].replace(" ", ""))
-
-    possible_ways = sum(
-        int((t - hold_time) * hold_time > d) for hold_time in range(1, t)
-    )
-    score *= possible_ways
-    return score
+    return ways_to_win(t, d)
 
 
 def main():
+    real_input = load_input(6)
     part_1_score = part1(TEST_INPUT)
     assert part_1_score == 288, part_1_score
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_score = part2(TEST_INPUT)
     assert part_2_score == 71503, part_2_score
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
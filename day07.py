@@ -1,17 +1,20 @@
 """Day 7: poker face"""
 
 from collections import Counter
-from pathlib import Path
+from collections.abc import Iterable
+from itertools import combinations_with_replacement
 from typing import Self
 
+import numpy as np
+
+from inputs import iter_lines, load_input
+
 TEST_INPUT = """32T3K 765
 T55J5 684
 KK677 28
 KTJJT 220
 QQQJA 483"""
 
-REAL_INPUT = Path("day07.txt").read_text()
-
 
 CARD_RANKS = {
     card: value
@@ -34,18 +37,14 @@ class Hand:
     def __init__(self, line: str, part_2: bool = False):
         self.hand, bid = line.split()
         self.bid = int(bid)
-        self.hand_rank = hand_rank(self.hand) if not part_2 else hand_rank_p2(self.hand)
+        self.hand_rank = hand_type(self.hand, part_2)
         self.card_ranks = tuple(
             (CARD_RANKS if not part_2 else CARD_RANKS_P2)[card] for card in self.hand
         )
+        self.key = sort_key(self.hand, part_2)
 
     def __lt__(self, other: Self) -> bool:
-        # do the minimum for sorting, implementing __lt__
-        # print(self, other, "lt")
-        if self.hand_rank < other.hand_rank:
-            # print("hand rank wins")
-            return True
-        return self.hand_rank == other.hand_rank and self.card_ranks < other.card_ranks
+        return self.key < other.key
 
     def __str__(self):
         return f"{self.hand} {self.bid} {self.hand_rank} {self.card_ranks}"
@@ -102,22 +101,75 @@ def hand_rank_p2(hand: str) -> int:
     return max(hand_rank(hand.replace("J", card)) for card in replacements)
 
 
-def part1(puzzle_input: str, part_2: bool = False) -> int:
-    hands = [Hand(line, part_2=part_2) for line in puzzle_input.splitlines()]
-    # print(list(sorted(hands)), "huh?")
-    score = 0
-
-    score = sum(
-        hand.bid * index
-        for index, hand in enumerate(
-            sorted(hands),
-            start=1,
-        )
-    )
-    return score
+def _build_hand_types() -> list[int]:
+    """hand_rank_p2 for every shape of hand, indexed by shape
+
+    The sum of (how many of each card) squared tells every shape of hand
+    apart (25 for five of a kind, 17 for quads, ... 5 for high card), even
+    with some of the cards taken out as jokers. So the shape is that sum
+    shifted up 3 bits plus the number of jokers.
+    """
+    types = [0] * (26 << 3)
+    for jokers in range(6):
+        for size in range(1, 6):
+            for counts in combinations_with_replacement(range(1, 6), size):
+                if sum(counts) != 5 - jokers:
+                    continue
+                hand = "".join(card * count for card, count in zip("AKQT9", counts))
+                squares = sum(count * count for count in counts)
+                types[squares << 3 | jokers] = hand_rank_p2(hand + "J" * jokers)
+    # and nothing but jokers
+    types[0 << 3 | 5] = hand_rank_p2("JJJJJ")
+    return types
+
+
+HAND_TYPES = _build_hand_types()
+
+
+def hand_type(hand: str, part_2: bool = False) -> int:
+    """Same as hand_rank (or hand_rank_p2), from the table"""
+    if part_2:
+        jokers = hand.count("J")
+        squares = sum(hand.count(card) for card in hand if card != "J")
+    else:
+        jokers = 0
+        squares = sum(map(hand.count, hand))
+    return HAND_TYPES[squares << 3 | jokers]
+
+
+def sort_key(hand: str, part_2: bool = False) -> int:
+    """The hand as one int that sorts hands by strength
+
+    The hand type goes in the top bits, then each card's rank in 4 bits in
+    the order they're dealt, so comparing two keys is the whole rule.
+    """
+    ranks = CARD_RANKS_P2 if part_2 else CARD_RANKS
+    key = hand_type(hand, part_2)
+    for card in hand:
+        key = key << 4 | ranks[card]
+    return key
+
+
+def total_winnings(keys: list[int], bids: list[int]) -> int:
+    """Sum of bid * rank, with the hands ranked by their sort keys"""
+    order = np.argsort(np.asarray(keys, dtype=np.int64), kind="stable")
+    ranks = np.arange(1, len(order) + 1, dtype=np.int64)
+    return int((np.asarray(bids, dtype=np.int64)[order] * ranks).sum())
+
+
+def part1(puzzle_input: str | Iterable[str], part_2: bool = False) -> int:
+    # ranking needs every hand, but only their keys and bids, not the text
+    keys = []
+    bids = []
+    for line in iter_lines(puzzle_input):
+        hand, bid = line.split()
+        keys.append(sort_key(hand, part_2))
+        bids.append(int(bid))
+    return total_winnings(keys, bids)
 
 
 def main():
+    real_input = load_input(7)
     assert Hand("KTJJT 220") < Hand("KK677 28"), (
         Hand("KTJJT 220").card_ranks,
         Hand("KK677 28").card_ranks,
@@ -130,10 +182,10 @@ def main():
     )
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 6440, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part1(TEST_INPUT, True)
     assert part_2_result == 5905, part_2_result
-    print(part1(REAL_INPUT, True))
+    print(part1(real_input, True))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 """Day 8: Haunted Wasteland"""
 
-from itertools import cycle
-from math import lcm
-from pathlib import Path
+from dataclasses import dataclass
+from math import gcd, lcm
 
+import numpy as np
+
+from inputs import load_input
 
 TEST_INPUT_1 = """RL
 
@@ -32,75 +34,203 @@ PART_2_TEST_INPUT = """LR
 22Z = (22B, 22B)
 XXX = (XXX, XXX)"""
 
-REAL_INPUT = Path("day08.txt").read_text()
+
+@dataclass
+class Route:
+    """When one ghost is standing on an end node
+
+    At each of the early times once, and then (from start + 1 on) whenever
+    (time - start) % period lands on one of the offsets.
+    """
+
+    early: list[int]
+    start: int
+    period: int
+    offsets: list[int]
+
+    def at_end(self, time: int) -> bool:
+        if time <= self.start:
+            return time in self.early
+        return (time - self.start) % self.period in self.offsets
+
+
+class Network:
+    """The map, with the nodes numbered and whole passes worked out up front
+
+    block[node] is where you end up after following every instruction once
+    starting from node, so finding a ghost's loop only takes one lookup per
+    pass. The steps of a pass only get walked (to see when it's on an end)
+    once per node a pass starts from, however many ghosts go through it.
+    """
+
+    def __init__(self, puzzle_input: str):
+        steps, nodes = puzzle_input.split("\n\n")
+        self.steps = [0 if movement == "L" else 1 for movement in steps.strip()]
+        lines = nodes.splitlines()
+        self.names = [line.split(" = ")[0] for line in lines]
+        self.ids = {name: node for node, name in enumerate(self.names)}
+        self.moves: tuple[list[int], list[int]] = ([], [])
+        for line in lines:
+            left, right = line.split(" = ")[1][1:-1].split(", ")
+            self.moves[0].append(self.ids[left])
+            self.moves[1].append(self.ids[right])
+        moves = (np.array(self.moves[0]), np.array(self.moves[1]))
+        block = np.arange(len(lines))
+        for step in self.steps:
+            block = moves[step][block]
+        self.block = block.tolist()
+        self._hits: dict[tuple[int, frozenset[int]], list[int]] = {}
+
+    def pass_hits(self, node: int, ends: frozenset[int]) -> list[int]:
+        """How many steps into a pass starting at node we're on an end"""
+        key = (node, ends)
+        if key not in self._hits:
+            self._hits[key] = self._walk_pass(node, ends)
+        return self._hits[key]
+
+    def _walk_pass(self, node: int, ends: frozenset[int]) -> list[int]:
+        hits = []
+        for steps_taken, step in enumerate(self.steps, start=1):
+            node = self.moves[step][node]
+            if node in ends:
+                hits.append(steps_taken)
+        return hits
+
+    def route(self, node: int, ends: frozenset[int]) -> Route:
+        """Follow a ghost a pass at a time until it's going round in circles"""
+        length = len(self.steps)
+        seen = {}
+        while node not in seen:
+            seen[node] = len(seen)
+            node = self.block[node]
+        loop_start = seen[node]
+        # seen is in the order the passes happen
+        passes = [self.pass_hits(start, ends) for start in seen]
+        early = [
+            index * length + hit
+            for index, hits in enumerate(passes[:loop_start])
+            for hit in hits
+        ]
+        period = (len(passes) - loop_start) * length
+        offsets = {
+            (index * length + hit) % period
+            for index, hits in enumerate(passes[loop_start:])
+            for hit in hits
+        }
+        # the ends can come round more often than the passes do
+        period = shortest_period(offsets, period)
+        return Route(
+            early=early,
+            start=loop_start * length,
+            period=period,
+            offsets=sorted({offset % period for offset in offsets}),
+        )
+
+
+def shortest_period(offsets: set[int], period: int) -> int:
+    """The shortest period that gives the same offsets (mod period)"""
+    if not offsets:
+        return period
+    first = min(offsets)
+    for other in sorted(offsets):
+        shift = other - first
+        if (
+            shift
+            and not period % shift
+            and all((offset + shift) % period in offsets for offset in offsets)
+        ):
+            return shift
+    return period
+
+
+def combine_cycles(
+    first: tuple[int, int],
+    second: tuple[int, int],
+) -> tuple[int, int] | None:
+    """Chinese remainder theorem for (remainder, modulus) pairs
+
+    The moduli don't have to be coprime; None if the two can never line up.
+    """
+    remainder, modulus = first
+    other_remainder, other_modulus = second
+    divisor = gcd(modulus, other_modulus)
+    if (other_remainder - remainder) % divisor:
+        return None
+    reduced = other_modulus // divisor
+    inverse = pow(modulus // divisor, -1, reduced)
+    multiple = (other_remainder - remainder) // divisor * inverse
+    combined = lcm(modulus, other_modulus)
+    return (remainder + modulus * (multiple % reduced)) % combined, combined
+
+
+def first_meeting(routes: list[Route]) -> int:
+    """The first time every ghost is on an end node at once"""
+    # either it's one of the times a ghost only gets to an end once...
+    candidates = [
+        time
+        for route in routes
+        for time in route.early
+        if all(other.at_end(time) for other in routes)
+    ]
+    # ...or it's when all their loops line up
+    earliest = max(route.start for route in routes) + 1
+    # every ghost so far is on an end at times that are one of remainders
+    # (mod modulus). Each ghost only keeps the remainders that line up with
+    # one of its own, and if the survivors repeat more often than modulus,
+    # the duplicates go too, so the set only grows when it has to.
+    remainders = {0}
+    modulus = 1
+    for route in sorted(routes, key=lambda route: len(route.offsets)):
+        remainders = {
+            combined[0]
+            for remainder in remainders
+            for offset in route.offsets
+            if (
+                combined := combine_cycles(
+                    (remainder, modulus), (route.start + offset, route.period)
+                )
+            )
+        }
+        if not remainders:
+            break
+        modulus = shortest_period(remainders, lcm(modulus, route.period))
+        remainders = {remainder % modulus for remainder in remainders}
+    for remainder in remainders:
+        candidates.append(earliest + (remainder - earliest) % modulus)
+    if not candidates:
+        raise ValueError("The ghosts never all get there")
+    return min(candidates)
 
 
 def part1(puzzle_input: str) -> int:
-    steps, nodes = puzzle_input.split("\n\n")
-    directions = {}
-    for line in nodes.splitlines():
-        source, target = line.split(" = ")
-        left, right = target[1:-1].split(", ")
-        directions[source] = (left, right)
-    location = "AAA"
-    instructions = cycle(steps)
-    steps_taken = 0
-    while location != "ZZZ":
-        left, right = directions[location]
-        movement = next(instructions)
-        if movement == "L":
-            location = left
-        else:
-            location = right
-        steps_taken += 1
-    return steps_taken
+    network = Network(puzzle_input)
+    route = network.route(network.ids["AAA"], frozenset([network.ids["ZZZ"]]))
+    return first_meeting([route])
 
 
 def part2(puzzle_input: str) -> int:
-    steps, nodes = puzzle_input.split("\n\n")
-    directions = {}
-    for line in nodes.splitlines():
-        source, target = line.split(" = ")
-        left, right = target[1:-1].split(", ")
-        directions[source] = (left, right)
-    locations = [loc for loc in directions if loc.endswith("A")]
-    instructions = cycle(steps)
-    steps_taken = 0
-    hits = {}
-    # print("locations", locations)
-    while not all(loc.endswith("Z") for loc in locations):
-        if len(hits) == len(locations):
-            # print("Found repeats:", hits)
-            return lcm(*hits.values())
-        new_locations = []
-        movement = next(instructions)
-        steps_taken += 1
-        for location in locations:
-            left, right = directions[location]
-
-            if movement == "L":
-                location = left
-            else:
-                location = right
-            if location.endswith("Z"):
-                index = len(new_locations)
-                print(f"move {steps_taken}: location {index} is at {location}")
-                hits.setdefault(index, steps_taken)
-            new_locations.append(location)
-        locations = new_locations
-
-    return steps_taken
+    network = Network(puzzle_input)
+    ends = frozenset(
+        node for node, name in enumerate(network.names) if name.endswith("Z")
+    )
+    routes = [
+        network.route(node, ends)
+        for node, name in enumerate(network.names)
+        if name.endswith("A")
+    ]
+    return first_meeting(routes)
 
 
 def main():
+    real_input = load_input(8)
     part_1_short = part1(TEST_INPUT_1)
     assert part_1_short == 2, part_1_short
     part_1_long = part1(TEST_INPUT_2)
     assert part_1_long == 6, part_1_long
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_test = part2(PART_2_TEST_INPUT)
     assert part_2_test == 6, part_2_test
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
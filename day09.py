@@ -1,52 +1,99 @@
 """Day 9: mirage maintenance"""
 
-from pathlib import Path
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import cache, partial
+from math import prod
+from operator import mul
+
+import numpy as np
+
+from inputs import iter_lines, load_input
+from parallel import map_reduce
 
 TEST_INPUT = """0 3 6 9 12 15
 1 3 6 10 15 21
 10 13 16 21 30 45"""
 
-REAL_INPUT = Path("day09.txt").read_text()
 
+# how many histories of the same length to extrapolate in one go
+BATCH_SIZE = 4096
 
-def history_with_next_step(history: list[int]) -> list[int]:
-    """Find the next value of a sequence using extrapolation"""
-    # print("a", history)
-    next_step = dxes(history)
-    # print("b", next_step)
-    if len(set(next_step)) == 1:
-        # print("done", history, history[-1], history[-2])
-        return history + [history[-1] + (history[-1] - history[-2])]
-    recursed = history_with_next_step(next_step)
-    # print("recursion result", recursed)
-    assert len(recursed) == len(history), (recursed, history)
-    return history + [history[-1] + recursed[-1]]
-
-
-def dxes(history: list[int]) -> list[int]:
-    """Keep working down the dx tree until we get all zeroes
-    >>> dxes([0, 3, 6, 9, 12, 15])
-    [3, 3, 3, 3, 3]
-
-    >>> dxes([1, 3, 6, 10, 15, 21, 28])
-    [2, 3, 4, 5, 6, 7]
+
+@cache
+def extrapolation_weights(length: int, steps: int = 1) -> tuple[int, ...]:
+    """The weights that take a history straight to the value steps past its end
+
+    The history is a polynomial of degree less than length sampled at 0, 1,
+    ..., length - 1 (the difference table bottoming out is exactly that), so
+    its value anywhere is a fixed mix of the samples: the Lagrange basis
+    polynomials evaluated there. At whole numbers those are all integers
+    (binomial coefficients with alternating signs).
+
+    >>> extrapolation_weights(3)
+    (1, -3, 3)
+    >>> extrapolation_weights(3, steps=-3)
+    (3, -3, 1)
     """
+    x = length - 1 + steps
+    weights = []
+    for i in range(length):
+        numerator = prod(x - j for j in range(length) if j != i)
+        denominator = prod(i - j for j in range(length) if j != i)
+        weights.append(numerator // denominator)
+    return tuple(weights)
 
-    return [dx - x for (x, dx) in zip(history[:-1], history[1:])]
+
+def extrapolate(histories: list[list[int]] | np.ndarray, steps: int = 1) -> np.ndarray:
+    """The value steps past the end of each history (rows of the same length)
+
+    One matrix-vector product for the lot. Falls back to python ints when
+    the sums might not fit in 64 bits (long histories, or far ahead).
+    """
+    try:
+        histories = np.asarray(histories, dtype=np.int64)
+    except OverflowError:
+        histories = np.asarray(histories, dtype=object)
+    weights = extrapolation_weights(histories.shape[1], steps)
+    biggest = int(np.abs(histories).max(initial=0)) * sum(map(abs, weights))
+    if histories.dtype == object or biggest >= 2**63:
+        return histories.astype(object) @ np.array(weights, dtype=object)
+    return histories @ np.array(weights, dtype=np.int64)
+
+
+def history_with_next_step(history: list[int]) -> list[int]:
+    """Find the next value of a sequence using extrapolation"""
+    weights = extrapolation_weights(len(history))
+    return history + [sum(map(mul, weights, history))]
 
 
-def part1(puzzle_input: str, part_2: bool = False) -> int:
-    lines = []
-    for line in puzzle_input.splitlines():
+def part1(
+    puzzle_input: str | Iterable[str],
+    part_2: bool = False,
+    workers: int | None = None,
+) -> int:
+    if workers:
+        return map_reduce(partial(part1, part_2=part_2), puzzle_input, workers)
+    total = 0
+    # histories can be different lengths, so they're batched up by length
+    batches = defaultdict(list)
+    for line in iter_lines(puzzle_input):
+        history = [int(num) for num in line.split()]
         if part_2:
-            lines.append([int(num) for num in reversed(line.split())])
-        else:
-            lines.append([int(num) for num in line.split()])
-    new_lines = [history_with_next_step(line) for line in lines]
-    return sum(line[-1] for line in new_lines)
+            history.reverse()
+        batch = batches[len(history)]
+        batch.append(history)
+        if len(batch) == BATCH_SIZE:
+            total += int(extrapolate(batch).sum())
+            batch.clear()
+    for batch in batches.values():
+        if batch:
+            total += int(extrapolate(batch).sum())
+    return total
 
 
 def main():
+    real_input = load_input(9)
     assert history_with_next_step([1, 3, 6, 10, 15, 21]) == [
         1,
         3,
@@ -58,10 +105,10 @@ def main():
     ], history_with_next_step([1, 3, 6, 10, 15, 21])
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 114, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part1(TEST_INPUT, True)
     assert part_2_result == 2, part_2_result
-    print(part1(REAL_INPUT, True))
+    print(part1(real_input, True))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
-from pathlib import Path
+"""Day 10: pipe maze"""
 
-import networkx
+from grid import Grid
+from inputs import load_input
 
 TEST_INPUT = """7-F7-
 .FJ|7
@@ -8,182 +9,116 @@ SJLL7
 |F--J
 LJ.LJ"""
 
-REAL_INPUT = Path("day10.txt").read_text()
-
-
-def parse_input(puzzle: str) -> tuple[tuple[int, int], networkx.Graph]:
-    start = ()
-    grid = networkx.Graph()
-    lines = puzzle.splitlines()
-    for y, row in enumerate(lines):
-        for x, char in enumerate(row):
-            # for each character, if the character adjacent to that
-            # spot is a valid conection (e.g. a | connects upward to a 7),
-            # add that edge to the graph
-            # print(x, y, char)
-            match char:
-                case "S":
-                    # print("start")
-                    start = (x, y)
-                case "|":
-                    # vertical
-                    # down needs to have a vertical part upwards
-                    try:
-                        if lines[y + 1][x] in "|LJS":
-                            # print("adding down")
-                            grid.add_edge((x, y), (x, y + 1))
-                    except IndexError:
-                        pass
-                    # up needs to have a vertical part downwards
-                    try:
-                        if lines[y - 1][x] in "|7FS":
-                            # print("adding up")
-                            grid.add_edge((x, y), (x, y - 1))
-                    except IndexError:
-                        pass
-                case "-":
-                    # horizontal
-                    # right needs to connect to west
-                    try:
-                        if lines[y][x + 1] in "S-J7":
-                            # print("adding right")
-                            grid.add_edge((x, y), (x + 1, y))
-                    except IndexError:
-                        pass
-                    # left needs to connect to east
-                    try:
-                        if lines[y][x - 1] in "S-FL":
-                            # print("adding left")
-                            grid.add_edge((x, y), (x - 1, y))
-                    except IndexError:
-                        pass
-                case "L":
-                    # connects N and E
-                    # up needs to have a vertical part downwards
-                    try:
-                        if lines[y - 1][x] in "|7FS":
-                            # print("adding up")
-                            grid.add_edge((x, y), (x, y - 1))
-                    except IndexError:
-                        pass
-                    # right needs to connect to west
-                    try:
-                        if lines[y][x + 1] in "S-J7":
-                            # print("adding right")
-                            grid.add_edge((x, y), (x + 1, y))
-                    except IndexError:
-                        pass
-                case "J":
-                    # connects N and W
-                    # up needs to have a vertical part downwards
-                    try:
-                        if lines[y - 1][x] in "|7FS":
-                            # print("adding up")
-                            grid.add_edge((x, y), (x, y - 1))
-                    except IndexError:
-                        pass
-                    # left needs to connect to east
-                    try:
-                        if lines[y][x - 1] in "S-FL":
-                            # print("adding left")
-                            grid.add_edge((x, y), (x - 1, y))
-                    except IndexError:
-                        pass
-                case "7":
-                    # S and W
-                    # down needs to have a vertical part upwards
-                    try:
-                        if lines[y + 1][x] in "|LJS":
-                            # print("adding down")
-                            grid.add_edge((x, y), (x, y + 1))
-                    except IndexError:
-                        pass
-                    # left needs to connect to east
-                    try:
-                        if lines[y][x - 1] in "S-FL":
-                            # print("adding left")
-                            grid.add_edge((x, y), (x - 1, y))
-                    except IndexError:
-                        pass
-                case "F":
-                    # print("SE")
-                    # S and E
-                    # down needs to have a vertical part upwards
-                    try:
-                        if lines[y + 1][x] in "|LJS":
-                            # print("adding down")
-                            grid.add_edge((x, y), (x, y + 1))
-                    except IndexError:
-                        # print("narp", (x, y + 1))
-                        pass
-                    # right needs to connect to west
-                    try:
-                        if lines[y][x + 1] in "S-J7":
-                            # print("adding right")
-                            grid.add_edge((x, y), (x + 1, y))
-                    except IndexError:
-                        pass
-                case ".":
-                    # ground
-                    pass
-                case _:
-                    raise ValueError(f"Unknown character {char}")
-    return start, grid
+PART_2_TEST_INPUT = """.F----7F7F7F7F-7....
+.|F--7||||||||FJ....
+.||.FJ||||||||L7....
+FJL7L7LJLJ||LJ.L-7..
+L--J.L7...LJS7F-7L7.
+....F-J..F7FJ|L7L7L7
+....L7.F7||L7|.L7L7|
+.....|FJLJ|FJ|F7|.LJ
+....FJL-7.||.||||...
+....L---J.LJ.LJLJ..."""
+
+START = ord("S")
+NORTH, EAST, SOUTH, WEST = (0, -1), (1, 0), (0, 1), (-1, 0)
+# which two ways each pipe goes
+PIPES = {
+    ord("|"): (NORTH, SOUTH),
+    ord("-"): (EAST, WEST),
+    ord("L"): (NORTH, EAST),
+    ord("J"): (NORTH, WEST),
+    ord("7"): (SOUTH, WEST),
+    ord("F"): (SOUTH, EAST),
+}
+
+
+def walk(
+    grid: Grid, start: tuple[int, int], bearing: tuple[int, int]
+) -> tuple[int, int, tuple[int, int]] | None:
+    """Follow the pipes out of start until they come back to it
+
+    Returns how long the loop is, twice the area it encloses (measured
+    through the middle of the tiles, by the shoelace formula) and which way
+    out of start it came back in by. None if the pipes stop joining up
+    first.
+    """
+    x, y = start
+    dx, dy = bearing
+    length = 0
+    twice_area = 0
+    while True:
+        twice_area += x * dy - y * dx
+        x += dx
+        y += dy
+        length += 1
+        if (x, y) == start:
+            return length, abs(twice_area), (-dx, -dy)
+        ends = PIPES.get(grid.get(x, y))
+        if ends is None or (-dx, -dy) not in ends:
+            return None
+        # carry on out of whichever end we didn't come in through
+        first, second = ends
+        dx, dy = second if first == (-dx, -dy) else first
+
+
+def find_loop(grid: Grid, start: tuple[int, int]) -> tuple[int, int, int]:
+    """The pipe under the S, and the length and twice the area of its loop
+
+    More than two neighbours can point at S when a stray pipe touches it,
+    so each shape S could be gets tried, and it's the one whose walk comes
+    back in through its other end.
+    """
+    walks = {}
+    for pipe, (out, back) in PIPES.items():
+        if out not in walks:
+            walks[out] = walk(grid, start, out)
+        if (loop := walks[out]) and loop[2] == back:
+            return pipe, loop[0], loop[1]
+    raise ValueError(f"no pipe under the S at {start} closes a loop")
+
+
+def start_shape(grid: Grid, x: int, y: int) -> int:
+    """Work out which pipe is hiding under the S"""
+    pipe, _, _ = find_loop(grid, (x, y))
+    return pipe
+
+
+def trace_loop(puzzle: str) -> tuple[int, int]:
+    """Walk once around the loop from S
+
+    Returns how long the loop is and twice the area it encloses, which is all
+    both parts need.
+    """
+    grid = Grid.from_text(puzzle)
+    _, length, twice_area = find_loop(grid, grid.find(START))
+    return length, twice_area
 
 
 def part1(puzzle: str) -> int:
-    start, grid = parse_input(puzzle)
-    max_dist = 0
-    for x, y in grid.nodes:
-        # print(x, y)
-        try:
-            if (
-                length := networkx.shortest_path_length(
-                    grid,
-                    start,
-                    (x, y),
-                )
-            ) > max_dist:
-                print(f"path from {start} to {x, y} is {length}")
-                max_dist = length
-        except networkx.exception.NetworkXNoPath:
-            pass
-
-    return max_dist
+    """How far round the loop is the furthest point from S?"""
+    length, _ = trace_loop(puzzle)
+    return length // 2
 
 
 def part2(puzzle: str) -> int:
-    start, grid = parse_input(puzzle)
-    start_trips = [edge for edge in grid.edges if start in edge]
-    assert len(start_trips) == 2, start_trips
-    last_stop = start_trips[-1]
-    other_dest = [coord for coord in last_stop if coord != start][0]
-    grid.remove_edge(*last_stop)
-    path_back = networkx.shortest_path(grid, start, other_dest)
-    main_loop = set(path_back)
-    main_loop.add(start)
-    insiders = 0
-    for y, line in enumerate(puzzle.splitlines()):
-        # print(y, insiders)
-        for x in range(len(line)):
-            if (x, y) not in main_loop:
-                verts_seen = 0
-                for dx in range(x):
-                    # note: visual inspection revealed my start piece is a J
-                    # effectively, we need to see how many times parity has
-                    # changed by looking at upward bends and pipes
-                    if (dx, y) in main_loop and line[dx] in "|JLS":
-                        verts_seen += 1
-                if verts_seen % 2 == 1:
-                    insiders += 1
-    return insiders
+    """How many tiles does the loop enclose?
+
+    Pick's theorem: area = inside + boundary / 2 - 1, and every tile on the
+    loop is a boundary point.
+    """
+    length, twice_area = trace_loop(puzzle)
+    return (twice_area - length) // 2 + 1
 
 
 def main():
+    real_input = load_input(10)
     part_1_test = part1(TEST_INPUT)
     assert part_1_test == 8, part_1_test
-    print(part1(REAL_INPUT))
-    print(part2(REAL_INPUT))
+    print(part1(real_input))
+    part_2_test = part2(PART_2_TEST_INPUT)
+    assert part_2_test == 8, part_2_test
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
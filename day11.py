@@ -1,7 +1,9 @@
 """Day 11: Cosmic Expansion"""
 
-from pathlib import Path
+import numpy as np
 
+from grid import Grid
+from inputs import load_input
 
 TEST_INPUT = """...#......
 .......#..
@@ -14,100 +16,64 @@ TEST_INPUT = """...#......
 .......#..
 #...#....."""
 
-REAL_INPUT = Path("day11.txt").read_text()
-
-
-def parse_input(puzzle: str) -> set[tuple[int, int]]:
-    vertically_expanded = []
-    for line in puzzle.splitlines():
-        if all(char == "." for char in line):
-            # if we have an entirely blank row, add it twice
-            vertically_expanded.append(line[:])
-        vertically_expanded.append(line[:])
-    # print("\n".join(vertically_expanded))
-    horizontally_expanded = [[] for _ in range(len(vertically_expanded))]
-    for x in range(len(vertically_expanded[0])):
-        if all(char == "." for char in (line[x] for line in vertically_expanded)):
-            for row in horizontally_expanded:
-                row.append(".")
-        for y in range(len(vertically_expanded)):
-            horizontally_expanded[y].append(vertically_expanded[y][x])
-    # print(horizontally_expanded)
-    grid = set()
-    for y, row in enumerate(horizontally_expanded):
-        for x, char in enumerate(row):
-            if char == "#":
-                grid.add((x, y))
-    return grid
+
+GALAXY = ord("#")
+
+
+def pairwise_distance_sum(values: np.ndarray) -> int:
+    """Sum of |a - b| over every pair, for values that are already sorted
+
+    The i-th smallest value is the bigger one in i pairs and the smaller one
+    in n - 1 - i, so it counts 2i - n + 1 times overall.
+    """
+    weights = 2 * np.arange(len(values), dtype=np.int64) - len(values) + 1
+    return int((values * weights).sum())
+
+
+def axis_sums(counts: np.ndarray) -> tuple[int, int]:
+    """Distance sums along one axis, from the galaxies in each row (or column)
+
+    Growing the universe moves each galaxy along by (factor - 1) for every
+    blank row before it, so the total is first + (factor - 1) * second: the
+    sum for the original positions, and the same sum for the blank counts.
+    """
+    blank = counts == 0
+    blanks_before = np.cumsum(blank) - blank
+    # one entry per galaxy, already sorted since we go along the axis in order
+    positions = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    gaps = np.repeat(blanks_before, counts)
+    return pairwise_distance_sum(positions), pairwise_distance_sum(gaps)
+
+
+def total_distances(puzzle_input: str, growth_factors: list[int]) -> list[int]:
+    """The sum of the distances between every pair of galaxies, for each factor"""
+    grid = Grid.from_text(puzzle_input)
+    galaxies = np.frombuffer(grid.data, dtype=np.uint8).reshape(grid.height, grid.width)
+    galaxies = galaxies == GALAXY
+    row_sum, row_gaps = axis_sums(galaxies.sum(axis=1))
+    column_sum, column_gaps = axis_sums(galaxies.sum(axis=0))
+    return [
+        row_sum + column_sum + (factor - 1) * (row_gaps + column_gaps)
+        for factor in growth_factors
+    ]
 
 
 def part1(puzzle_input: str) -> int:
-    grid = list(parse_input(puzzle_input))
-    # print(grid)
-    distances = 0
-    for index, (x, y) in enumerate(grid):
-        for dx, dy in grid[index + 1 :]:
-            distances += abs(dx - x) + abs(dy - y)
-    return distances
-
-
-def parse_input_part_2(puzzle: str) -> tuple[set[tuple[int, int]], set[int], set[int]]:
-    grid = set()
-    blank_rows = set()
-    blank_columns = set()
-    lines = puzzle.splitlines()
-    for index, line in enumerate(lines):
-        if all(char == "." for char in line):
-            blank_rows.add(index)
-    for x in range(len(lines[0])):
-        if all(char == "." for char in (line[x] for line in lines)):
-            blank_columns.add(x)
-    for y, row in enumerate(lines):
-        for x, char in enumerate(row):
-            if char == "#":
-                grid.add((x, y))
-    return grid, blank_rows, blank_columns
+    return total_distances(puzzle_input, [2])[0]
 
 
 def part2(puzzle_input: str, growth_factor: int = 1_000_000) -> int:
-    grid, blank_rows, blank_columns = parse_input_part_2(puzzle_input)
-    grid = list(grid)
-    # print(grid, blank_rows, blank_columns)
-    distances = 0
-    for index, (x, y) in enumerate(grid):
-        for dx, dy in grid[index + 1 :]:
-            low_x, high_x = sorted([x, dx])
-            low_y, high_y = sorted([y, dy])
-            blank_rows_hit = blank_rows.intersection(range(low_y, high_y + 1))
-            blank_columns_hit = blank_columns.intersection(range(low_x, high_x + 1))
-            extra_x = 0
-            extra_y = 0
-            if blank_rows_hit:
-                extra_y = len(blank_rows_hit) * (growth_factor - 1)
-            if blank_columns_hit:
-                extra_x = len(blank_columns_hit) * (growth_factor - 1)
-            dist = (abs(dx - x) + extra_x) + (abs(dy - y) + extra_y)
-            # print(
-            #     (x, y),
-            #     (dx, dy),
-            #     dist,
-            #     extra_x,
-            #     blank_columns_hit,
-            #     extra_y,
-            #     blank_rows_hit,
-            # )
-            distances += dist
-
-    return distances
+    return total_distances(puzzle_input, [growth_factor])[0]
 
 
 def main():
+    real_input = load_input(11)
     test_result = part1(TEST_INPUT)
     assert test_result == 374, test_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_test_result = part2(TEST_INPUT, 10)
     assert part_2_test_result == 1030, part_2_test_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
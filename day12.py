@@ -1,5 +1,8 @@
-from pathlib import Path
-from functools import cache
+from collections.abc import Iterable, Iterator
+from functools import partial
+
+from inputs import iter_lines, load_input
+from parallel import map_reduce
 
 TEST_INPUT = """???.### 1,1,3
 .??..??...?##. 1,1,3
@@ -8,20 +11,20 @@ TEST_INPUT = """???.### 1,1,3
 ????.######..#####. 1,6,5
 ?###???????? 3,2,1"""
 
-REAL_INPUT = Path("day12.txt").read_text()
-
 
-def parse_input(puzzle: str, part2: bool = False) -> list[tuple[str, tuple[int]]]:
-    output = []
-    for line in puzzle.splitlines():
+def parse_input(
+    puzzle: str | Iterable[str],
+    unfold: int = 1,
+) -> Iterator[tuple[str, tuple[int]]]:
+    """Each row's survey and group sizes, unfolded (part 2 uses 5) times"""
+    for line in iter_lines(puzzle):
         options, combos = line.split()
-        if part2:
-            combos = ",".join([combos, combos, combos, combos, combos])
-            options = "?".join([options, options, options, options, options])
+        if unfold > 1:
+            combos = ",".join([combos] * unfold)
+            options = "?".join([options] * unfold)
 
         numbers = tuple(int(i) for i in combos.split(","))
-        output.append((options, numbers))
-    return output
+        yield options, numbers
 
 
 def valid_in_progress(survey: str, combinations: list[int]) -> bool:
@@ -67,36 +70,57 @@ def line_meets_survey(survey: list[bool], combinations: tuple[int]) -> bool:
     return found_results == list(combinations)
 
 
-@cache
-def fit_count(survey: str, counts: tuple[int]) -> int:
-    # print(f"{survey=}, {counts=}")
-    if not counts:
-        return int("#" not in survey)
-
-    # what's our biggest group?
-    biggest = max(counts)
-    biggest_index = counts.index(biggest)
-    left_counts, right_counts = counts[:biggest_index], counts[biggest_index + 1 :]
-
-    start_buffer = sum(left_counts) + len(left_counts)
-    end_buffer = sum(right_counts) + len(right_counts)
-
-    total = 0
-    for index in range(start_buffer, len(survey) - end_buffer - biggest + 1):
-        # split at the biggest and recursively check
-        block_pattern = survey[index : index + biggest]
-        left_border = "" if not index else survey[index - 1]
-        right_border = "" if index + biggest == len(survey) else survey[index + biggest]
-        # print(index, block_pattern, left_border, right_border)
-        if "." not in block_pattern and left_border != "#" and right_border != "#":
-            # if we have a valid large block that can be swapped around, find our boundary
-            # counts and multipy them together
-            left_total = fit_count(survey[: index - len(left_border)], left_counts)
-            right_total = fit_count(
-                survey[index + biggest + len(right_border) :], right_counts
-            )
-            total += left_total * right_total
-    return total
+class SpringCounter:
+    """Counts the arrangements for one row at a time, reusing its buffers
+
+    Working along the row with a "." stuck on the front, ways[p] is how many
+    ways there are to fit the first so many groups into the first p spots,
+    with every # before p used up. Going from one group to the next only
+    needs the previous group's ways, so there are only ever two of those
+    lists (plus where the runs of #/? end), all kept between rows. So the
+    memory only grows with the longest row, however many rows there are.
+    """
+
+    def __init__(self):
+        self.previous: list[int] = []
+        self.current: list[int] = []
+        # how many #/? in a row end just before each spot
+        self.runs: list[int] = []
+
+    def _grow(self, size: int):
+        if len(self.runs) < size:
+            extra = [0] * (size - len(self.runs))
+            self.previous += extra
+            self.current += extra
+            self.runs += extra
+
+    def count(self, survey: str, groups: tuple[int, ...]) -> int:
+        """How many ways the ?s can be filled in to match the groups"""
+        row = "." + survey
+        size = len(row) + 1
+        self._grow(size)
+        runs = self.runs
+        previous = self.previous
+        runs[0] = 0
+        # no groups yet: fine for as long as there haven't been any #s
+        previous[0] = 1
+        for spot in range(1, size):
+            runs[spot] = runs[spot - 1] + 1 if row[spot - 1] != "." else 0
+            previous[spot] = previous[spot - 1] if row[spot - 1] != "#" else 0
+        for group in groups:
+            current = self.current
+            current[0] = 0
+            for spot in range(1, size):
+                # either this spot is a "." (so it can't be a #)...
+                ways = current[spot - 1] if row[spot - 1] != "#" else 0
+                # ...or the group ends here, with a "." (not a #) before it
+                before = spot - group - 1
+                if runs[spot] >= group and before >= 0 and row[before] != "#":
+                    ways += previous[before]
+                current[spot] = ways
+            self.previous, self.current = current, previous
+            previous = current
+        return previous[size - 1]
 
 
 def valid_combos(survey: str, combinations: tuple[int]) -> int:
@@ -121,33 +145,32 @@ def valid_combos(survey: str, combinations: tuple[int]) -> int:
     )
 
 
-def part1(puzzle: str) -> int:
-    lines = parse_input(puzzle=puzzle)
-    score = 0
-    for survey, combos in lines:
-        s = valid_combos(survey, combos)
-        # print(survey, combos, s)
-        score += s
-    return score
+def part1(puzzle: str | Iterable[str]) -> int:
+    return part2(puzzle, unfold=1)
 
 
-def part2(puzzle: str) -> int:
-    lines = parse_input(puzzle=puzzle, part2=True)
+def part2(
+    puzzle: str | Iterable[str],
+    workers: int | None = None,
+    unfold: int = 5,
+) -> int:
+    if workers:
+        return map_reduce(partial(part2, unfold=unfold), puzzle, workers)
+    counter = SpringCounter()
     score = 0
-    for survey, combos in lines:
-        s = fit_count(survey, combos)
-        # print(survey, combos, s)
-        score += s
+    for survey, combos in parse_input(puzzle=puzzle, unfold=unfold):
+        score += counter.count(survey, combos)
     return score
 
 
 def main():
+    real_input = load_input(12)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 21, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 525152, part_2_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 """day 14: rolling rocks"""
-from copy import deepcopy
-from pathlib import Path
+
+import numpy as np
+
+from grid import Grid
+from inputs import load_input
 
 # NOTE: Chrome tried to ruin my input by "translating" from Portuguese
 
@@ -16,176 +19,14 @@ O.#..O.#.#
 #....###..
 #OO..#...."""
 
-REAL_INPUT = Path("day14.txt").read_text()
-
-
-def parse_input(puzzle: str) -> list[list[bool | None]]:
-    grid = []
-    for line in puzzle.splitlines():
-        grid.append(
-            [
-                {
-                    "#": False,
-                    "O": True,
-                    ".": None,
-                }[char]
-                for char in line
-            ]
-        )
-    return grid
-
-
-def move_north(grid: list[list[bool | None]]):
-    """
-    Do a single iteration of moving everything northward that can move north
-    """
-    # old_grid = grid
-    grid = deepcopy(grid)
-    for y, row in enumerate(grid[1:], start=1):
-        for x, rolling in enumerate(row):
-            if rolling and grid[y - 1][x] is None:
-                delta = 1
-                try:
-                    while grid[y - delta][x] is None:
-                        delta += 1
-                        if y - delta < 0:
-                            break
-                except IndexError:
-                    # end of the board, don't care
-                    pass
-                delta -= 1
-                # print(f"swapping from {y, x} to {y - delta, x}")
-                grid[y - delta][x] = rolling
-                row[x] = None
-    # print_grid(old_grid)
-    # print("---")
-    # print_grid(grid)
-    # print("====")
-    return grid
-
-
-def move_south(grid: list[list[bool | None]]) -> list[list[bool | None]]:
-    """
-    Do a single iteration of moving everything southward that can move south
-    """
-    # it's easiest to flip the grid vertically and flip back
-    return list(reversed(move_north(list(reversed(grid)))))
-
-
-def move_east(grid: list[list[bool | None]]) -> list[list[bool | None]]:
-    grid = deepcopy(grid)
-    for y, row in enumerate(grid):
-        row_interim = list(reversed(row))
-        # print(
-        #     puzzle_to_string([row]),
-        #     "became",
-        #     puzzle_to_string([row_interim]),
-        # )
-        # this one is obnoxious: we have to work backwards
-        for x, rolling in enumerate(row_interim[1:], start=1):
-            if rolling and row_interim[x - 1] is None:
-                delta = 1
-                try:
-                    while row_interim[x - delta] is None:
-                        delta += 1
-                        if x - delta < 0:
-                            break
-                except IndexError:
-                    pass
-                delta -= 1
-                row_interim[x - delta] = rolling
-                row_interim[x] = None
-                # print("after swap at ", x, puzzle_to_string([row_interim]))
-        # now save the fixed row
-
-        grid[y] = list(reversed(row_interim))
-        # print("and finally", puzzle_to_string([grid[y]]))
-    return grid
-
-
-def move_west(grid: list[list[bool | None]]) -> list[list[bool | None]]:
-    grid = deepcopy(grid)
-    for row in grid:
-        for x, rolling in enumerate(row[1:], start=1):
-            if rolling and row[x - 1] is None:
-                delta = 1
-                try:
-                    while row[x - delta] is None:
-                        delta += 1
-                        if x - delta < 0:
-                            break
-                except IndexError:
-                    pass
-                delta -= 1
-                row[x - delta] = rolling
-                row[x] = None
-    return grid
-
-
-def puzzle_to_string(grid: list[list[bool | None]]) -> str:
-    return "\n".join(
-        "".join(
-            {
-                None: ".",
-                True: "O",
-                False: "#",
-            }[rolling]
-            for rolling in row
-        )
-        for row in grid
-    )
-
 
-def print_grid(grid: list[list[bool | None]]):
-    for row in grid:
-        for rolling in row:
-            print(
-                {
-                    None: ".",
-                    True: "O",
-                    False: "#",
-                }[rolling],
-                end="",
-            )
-        print("")
+ROUND = ord("O")
+CUBE = ord("#")
+EMPTY = ord(".")
 
-
-def part1(puzzle: str) -> int:
-    grid = parse_input(puzzle)
-
-    new_grid = move_north(grid)
-    score = 0
-    for weight, row in enumerate(reversed(new_grid), start=1):
-        score += weight * sum(rolling is True for rolling in row)
-    return score
-
-
-def part2(puzzle: str) -> int:
-    grid = parse_input(puzzle)
-    seen: dict[str, int] = {}
-    turns = 0
-    repeated = False
-    while turns < 1_000_000_000:
-        turns += 1
-        grid = move_north(grid)
-        # print("done with N")
-        # print_grid(grid)
-        grid = move_west(grid)
-        # print("done with W")
-        # print_grid(grid)
-        grid = move_south(grid)
-        # print("done with S")
-        # print_grid(grid)
-        grid = move_east(grid)
-        # print("done with E")
-        # print_grid(grid)
-
-        if puzzle == TEST_INPUT:
-            if turns == 1:
-                stringified = puzzle_to_string(grid)
-                assert (
-                    stringified
-                    == """.....#....
+# what the test platform looks like after each of the first few spin cycles
+TEST_CYCLES = [
+    """.....#....
 ....#...O#
 ...OO##...
 .OO#......
@@ -194,14 +35,8 @@ def part2(puzzle: str) -> int:
 ....O#....
 ......OOOO
 #...O###..
-#..OO#...."""
-                ), stringified
-                print("turn 1 ok")
-            if turns == 2:
-                stringified = puzzle_to_string(grid)
-                assert (
-                    stringified
-                    == """.....#....
+#..OO#....""",
+    """.....#....
 ....#...O#
 .....##...
 ..O#......
@@ -210,14 +45,8 @@ def part2(puzzle: str) -> int:
 ....O#...O
 .......OOO
 #..OO###..
-#.OOO#...O"""
-                ), stringified
-                print("turn 2 ok")
-            if turns == 3:
-                stringified = puzzle_to_string(grid)
-                assert (
-                    stringified
-                    == """.....#....
+#.OOO#...O""",
+    """.....#....
 ....#...O#
 .....##...
 ..O#......
@@ -226,36 +55,120 @@ def part2(puzzle: str) -> int:
 ....O#...O
 .......OOO
 #...O###.O
-#.OOO#...O"""
-                ), stringified
-                print("turn 3 ok")
-        new_grid = puzzle_to_string(grid)
-        if not repeated:
-            try:
-                old_turn = seen[new_grid]
-            except KeyError:
-                seen[new_grid] = turns
-            else:
-                print("repeat after turn", turns, "from", old_turn)
-                repeated = True
-                delta = turns - old_turn
-                while turns <= 1_000_000_000:
-                    turns += delta
-                turns -= delta
+#.OOO#...O""",
+]
+
+
+def parse_input(puzzle: str) -> Grid:
+    return Grid.from_text(puzzle)
+
+
+class Platform:
+    """The rocks on the platform, with everything needed to tilt it worked out
+
+    The cube rocks never move, so for each direction we split every row or
+    column into segments between cubes and note how far each cell is from
+    the uphill end of its segment. Tilting is then just counting the round
+    rocks in each segment and filling that many cells from the uphill end,
+    which numpy does for the whole platform at once.
+    """
+
+    def __init__(self, grid: Grid):
+        cells = np.frombuffer(grid.data, dtype=np.uint8).reshape(
+            grid.height, grid.width
+        )
+        self.width = grid.width
+        self.height = grid.height
+        self.cubes = cells == CUBE
+        # flattened, one bool per cell
+        self.rocks = (cells == ROUND).ravel()
+        self.row_weights = np.arange(self.height, 0, -1)
+        # for each direction: views that turn the platform so that direction
+        # is "up" (index 0 along axis 0) and back again
+        orientations = {
+            "N": (lambda a: a, lambda a: a),
+            "S": (lambda a: a[::-1], lambda a: a[::-1]),
+            "W": (lambda a: a.T, lambda a: a.T),
+            "E": (lambda a: a.T[::-1], lambda a: a[::-1].T),
+        }
+        self.tilts = {
+            direction: self._segments(*orientation)
+            for direction, orientation in orientations.items()
+        }
+
+    def _segments(self, turn, unturn) -> tuple[np.ndarray, np.ndarray, int]:
+        """Segment id and distance from the uphill end for every cell"""
+        cubes = turn(self.cubes)
+        length, lines = cubes.shape
+        positions = np.arange(length)[:, None]
+        # each cube starts a new segment for the cells below it
+        segments = np.cumsum(cubes, axis=0) + np.arange(lines) * (length + 1)
+        last_cube = np.maximum.accumulate(np.where(cubes, positions, -1), axis=0)
+        ranks = np.where(cubes, length, positions - last_cube - 1)
+        return (
+            unturn(segments).ravel(),
+            unturn(ranks).ravel(),
+            lines * (length + 1),
+        )
+
+    def tilt(self, direction: str):
+        segments, ranks, size = self.tilts[direction]
+        counts = np.bincount(segments[self.rocks], minlength=size)
+        self.rocks = ranks < counts[segments]
+
+    def spin(self):
+        for direction in "NWSE":
+            self.tilt(direction)
 
-    score = 0
-    for weight, row in enumerate(reversed(grid), start=1):
-        score += weight * sum(rolling is True for rolling in row)
-    return score
+    def north_load(self) -> int:
+        rows = self.rocks.reshape(self.height, self.width).sum(axis=1)
+        return int(rows @ self.row_weights)
+
+    def state(self) -> bytes:
+        """The round rocks packed one bit per cell, good for spotting repeats"""
+        return np.packbits(self.rocks).tobytes()
+
+    def __str__(self) -> str:
+        cells = np.full(self.width * self.height, EMPTY, dtype=np.uint8)
+        cells[self.cubes.ravel()] = CUBE
+        cells[self.rocks] = ROUND
+        return str(Grid(self.width, self.height, bytearray(cells.tobytes())))
+
+
+def part1(puzzle: str) -> int:
+    platform = Platform(parse_input(puzzle))
+    platform.tilt("N")
+    return platform.north_load()
+
+
+def part2(puzzle: str, cycles: int = 1_000_000_000) -> int:
+    platform = Platform(parse_input(puzzle))
+    seen: dict[bytes, int] = {}
+    loads: list[int] = []
+    for turn in range(cycles):
+        state = platform.state()
+        if state in seen:
+            # everything from here on repeats, so skip straight to the end
+            first_seen = seen[state]
+            print("repeat after turn", turn, "from", first_seen)
+            return loads[first_seen + (cycles - first_seen) % (turn - first_seen)]
+        seen[state] = turn
+        loads.append(platform.north_load())
+        platform.spin()
+        if puzzle == TEST_INPUT and turn < len(TEST_CYCLES):
+            stringified = str(platform)
+            assert stringified == TEST_CYCLES[turn], stringified
+    return platform.north_load()
 
 
 def main():
+    real_input = load_input(14)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 136, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 64, part_2_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
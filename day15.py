@@ -1,62 +1,142 @@
 "Day 15: hashing some lenses"
 
-from pathlib import Path
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cache
+from itertools import batched
+from operator import mul
+from typing import TextIO
 
+import numpy as np
 
-TEST_INPUT = """rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7"""
-
-REAL_INPUT = Path("day15.txt").read_text().replace("\n", "")
-
-
-def hash_character(char: str, starting_value: int = 0) -> int:
-    return ((ord(char) + starting_value) * 17) % 256
+from inputs import load_input
 
 
-def hash_string(string: str) -> int:
-    score = 0
-    for char in string:
-        score = hash_character(char, score)
-    return score
-
-
-def part1(puzzle: str) -> int:
-    return sum(hash_string(substr) for substr in puzzle.split(","))
-
+TEST_INPUT = """rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7"""
 
-def part2(puzzle: str) -> int:
-    # NOTE: Thank $DEITY for preserving dictionary order insertion!
-    boxes: list[dict[str, int]] = [{} for _ in range(256)]
-    for instr in puzzle.split(","):
-        if instr.endswith("-"):
-            box_number = hash_string(instr[:-1])
-            try:
-                del boxes[box_number][instr[:-1]]
-            except KeyError:
-                pass
-        else:
-            assert instr[-2] == "="
-            label, focal_length = instr.split("=")
-            box_number = hash_string(label)
-            boxes[box_number][label] = int(focal_length)
-    total = 0
-    for box_number, box in enumerate(boxes, start=1):
-        box_power = sum(
-            box_number * box_index * focal_length
-            for box_index, focal_length in enumerate(box.values(), start=1)
-        )
-        total += box_power
-    return total
+# how many steps to hash at once
+BATCH_SIZE = 4096
+# how much of a file to read at once
+CHUNK_SIZE = 1 << 16
+
+
+@cache
+def hash_weights(length: int) -> tuple[int, ...]:
+    """What each character of a string that long is worth to HASH
+
+    Adding a character then multiplying by 17 (mod 256) unrolls to the i-th
+    character getting multiplied by 17 once for itself and once for every
+    character after it.
+    """
+    return tuple(pow(17, length - index, 256) for index in range(length))
+
+
+def hash_string(string: str | bytes) -> int:
+    if isinstance(string, str):
+        string = string.encode("ascii")
+    return sum(map(mul, string, hash_weights(len(string)))) % 256
+
+
+def hash_many(steps: Sequence[str]) -> np.ndarray:
+    """hash_string for a whole batch of steps
+
+    Steps of the same length get stacked into one array of characters, so
+    each length is one matrix-vector product.
+    """
+    hashes = np.zeros(len(steps), dtype=np.int64)
+    by_length = defaultdict(list)
+    for index, step in enumerate(steps):
+        by_length[len(step)].append(index)
+    for length, indexes in by_length.items():
+        characters = np.frombuffer(
+            "".join(steps[index] for index in indexes).encode("ascii"),
+            dtype=np.uint8,
+        ).reshape(len(indexes), length)
+        weights = np.array(hash_weights(length), dtype=np.int64)
+        hashes[indexes] = characters @ weights % 256
+    return hashes
+
+
+def iter_steps(puzzle: str | TextIO | Iterable[str]) -> Iterator[str]:
+    """The comma separated steps one at a time, ignoring any newlines
+
+    puzzle can be the whole line as a string, an open file (read a chunk at
+    a time) or any other source of pieces of the line.
+    """
+    if isinstance(puzzle, str):
+        pieces = [puzzle]
+    elif hasattr(puzzle, "read"):
+        pieces = iter(lambda: puzzle.read(CHUNK_SIZE), "")
+    else:
+        pieces = puzzle
+    partial = ""
+    for piece in pieces:
+        piece = partial + piece.replace("\n", "")
+        start = 0
+        while (end := piece.find(",", start)) != -1:
+            yield piece[start:end]
+            start = end + 1
+        partial = piece[start:]
+    if partial:
+        yield partial
+
+
+class LensBoxes:
+    """All 256 boxes of lenses in one dict
+
+    The dict keeps labels in the order they first went in (replacing a lens
+    doesn't move it, and removing one is a plain del), and that's the order
+    the lenses sit in within each box, so the boxes don't need to be kept
+    apart until it's time to add up the focusing power.
+    """
+
+    def __init__(self):
+        self.lenses: dict[str, tuple[int, int]] = {}
+
+    def put(self, label: str, box: int, focal_length: int):
+        self.lenses[label] = (box, focal_length)
+
+    def remove(self, label: str):
+        self.lenses.pop(label, None)
+
+    def focusing_power(self) -> int:
+        slots = [0] * 256
+        total = 0
+        for box, focal_length in self.lenses.values():
+            slots[box] += 1
+            total += (box + 1) * slots[box] * focal_length
+        return total
+
+
+def part1(puzzle: str | TextIO | Iterable[str]) -> int:
+    return sum(
+        int(hash_many(steps).sum()) for steps in batched(iter_steps(puzzle), BATCH_SIZE)
+    )
+
+
+def part2(puzzle: str | TextIO | Iterable[str]) -> int:
+    boxes = LensBoxes()
+    for steps in batched(iter_steps(puzzle), BATCH_SIZE):
+        labels = [step.split("=")[0].rstrip("-") for step in steps]
+        for step, label, box in zip(steps, labels, hash_many(labels).tolist()):
+            if step.endswith("-"):
+                boxes.remove(label)
+            else:
+                assert step[-2] == "="
+                boxes.put(label, box, int(step[len(label) + 1 :]))
+    return boxes.focusing_power()
 
 
 def main():
+    real_input = load_input(15).replace("\n", "")
     assert hash_string("HASH") == 52, hash_string("HASH")
     assert hash_string("rn") == 0, hash_string("rn")
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 1320, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 145, part_2_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 """Day 16: the floor will be lava"""
 
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from grid import Grid
+from inputs import load_input
 
 TEST_INPUT = """.|...\\....
 |.-.\\.....
@@ -13,205 +16,216 @@ TEST_INPUT = """.|...\\....
 .|....-|.\\
 ..//.|...."""
 
-REAL_INPUT = Path("day16.txt").read_text()
-
 
-def display_path_hit(puzzle: str, spots_seen: set[tuple[complex, complex]]):
-    positions = set(pos for pos, _ in spots_seen)
-    for y, row in enumerate(puzzle.splitlines()):
-        for x, char in enumerate(row):
-            if x - (1j * y) in positions:
-                print("#", end="")
-            else:
-                print(char, end="")
-        print()
+# bearings, clockwise from east
+EAST, SOUTH, WEST, NORTH = range(4)
+STEPS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+MIRRORS = {
+    ord("/"): [NORTH, WEST, SOUTH, EAST],
+    ord("\\"): [SOUTH, EAST, NORTH, WEST],
+}
+# which bearings hit each splitter on the flat side, and where the beams go
+SPLITTERS = {
+    ord("-"): ({NORTH, SOUTH}, (EAST, WEST)),
+    ord("|"): ({EAST, WEST}, (NORTH, SOUTH)),
+}
 
 
-def part1(
-    puzzle: str,
-    start_position: complex = -1 + 0j,
-    start_heading: complex = 1 + 0j,
-) -> int:
-    grid: dict[complex, str] = {}
-    lines = puzzle.splitlines()
-    assert len(set(len(line) for line in lines)) == 1
-    for y, row in enumerate(lines):
-        for x, char in enumerate(row):
-            grid[x - (1j * y)] = char
-    # position, bearing
-    beams: set[tuple[complex, complex]] = {(start_position, start_heading)}
-    spots_seen: set[tuple[complex, complex]] = set(list(beams))
-    while beams:
-        if puzzle == TEST_INPUT and len(beams) > 15:
-            raise ValueError("uh no")
-        old_spots_seen = sorted(
-            (pos.real, pos.imag, heading.real, heading.imag)
-            for pos, heading in spots_seen
-        )
-        new_beams = set()
-        for position, bearing in beams:
-            new_position = position + bearing
-            # print(position, bearing, new_position, grid.get(new_position), len(beams))
-            if (new_position, bearing) in spots_seen:
-                continue
-            spots_seen.add((new_position, bearing))
-            try:
-                match grid[new_position]:
-                    case ".":
-                        # simple case: save and continue
-                        new_beams.add((new_position, bearing))
-                    case "-":
-                        if bearing in (1 + 0j, -1 + 0j):
-                            # hits the pointy end, nothing happens
-                            new_beams.add((new_position, bearing))
-                        else:
-                            # hits the flat end, two beams perpendicular happen
-
-                            new_beams |= {
-                                (new_position, 1 + 0j),
-                                (new_position, -1 + 0j),
-                            }
-                    case "|":
-                        if bearing in (1j, -1j):
-                            # hits the pointy end, nothing happens
-                            new_beams.add((new_position, bearing))
-                        else:
-                            # hits the flat end, two beams perpendicular happen
-                            new_beams |= {
-                                (new_position, 1j),
-                                (new_position, -1j),
-                            }
-                    case "/":
-                        # hits a reflection!
-                        match bearing:
-                            case 1 + 0j:
-                                # going up
-                                # print('hit /, going right to up')
-                                bearing = 1j
-                            case -1 + 0j:
-                                # print('hit /, going left to down')
-                                # going down
-                                bearing = -1j
-                            case 1j:
-                                # going right
-                                # print('hit /, going up to right')
-                                bearing = 1 + 0j
-                            case -1j:
-                                # going left
-                                # print('hit /, going down to left')
-                                bearing = -1 + 0j
-                            case _:
-                                raise ValueError(f"Unknown direction {bearing}")
-                        new_beams.add((new_position, bearing))
-                    case "\\":
-                        # other reflection!
-                        match bearing:
-                            case 1 + 0j:
-                                # going down
-                                # print('hit \\, going from right to down')
-                                bearing = -1j
-                            case -1 + 0j:
-                                # going up
-                                # print('hit \\, going from left to up')
-                                bearing = 1j
-                            case 1j:
-                                # going left
-                                # print('hit \\, going from up to left')
-                                bearing = -1 + 0j
-                            case -1j:
-                                # going right
-                                # print('hit \\, going from down to right')
-                                bearing = 1 + 0j
-                            case _:
-                                raise ValueError(f"Unknown direction {bearing}")
-                        new_beams.add((new_position, bearing))
-                    case _:
-                        raise ValueError(f"Unknown char {char}")
-            except KeyError:
-                # print('end of the world')
-                spots_seen.remove((new_position, bearing))
-        if (
-            sorted(
-                (pos.real, pos.imag, heading.real, heading.imag)
-                for pos, heading in spots_seen
+def display_path_hit(puzzle: str, tiles: int):
+    """Show which tiles (a bitset of flat grid indexes) are energized"""
+    grid = Grid.from_text(puzzle)
+    for y in range(grid.height):
+        print(
+            "".join(
+                "#" if tiles >> (y * grid.width + x) & 1 else chr(grid[x, y])
+                for x in range(grid.width)
             )
-            == old_spots_seen
-        ):
-            # print('done?')
-            len(set(pos for pos, _ in spots_seen)) - 1
-        beams = new_beams
-        # display_path_hit(puzzle, spots_seen)
-    # print('all beams finished')
-    # display_path_hit(puzzle, spots_seen)
-    return len(set(pos for pos, _ in spots_seen)) - 1
-
-
-def part2(puzzle: str) -> int:
-    """Find the starting position that gives the highest number of lit tiles"""
-    # NOTE: mine found the right answer at x = 23, so I entered each one as it
-    # came through as guesses because I didn't want to wait around for
-    # the whole thing to finish
-    min_x = 0
-    max_y = 0
-    lines = puzzle.splitlines()
-    max_x = len(lines[0])
-    min_y = 0 - len(lines)
-    # start at the top, pointing down
-    print("grid size", max_x, min_y)
-    score = 0
-    for x in range(min_x, max_x):
-        score = max(
-            part1(
-                puzzle=puzzle,
-                start_position=(x + 1j),
-                start_heading=-1j,
-            ),
-            score,
-        )
-        # now from the bottom, going up
-        score = max(
-            part1(
-                puzzle=puzzle,
-                start_position=(x + min_y * 1j),
-                start_heading=1j,
-            ),
-            score,
         )
-        print(x, score)
-    print("x result", score)
-    for y in range(min_y + 1, max_y + 1):
-        # from the left, going right
-        start_heading = 1 + 0j
-        score = max(
-            part1(
-                puzzle=puzzle,
-                start_position=(-1 + 1j * y),
-                start_heading=start_heading,
-            ),
-            score,
-        )
-        # from the right, going left
-        start_heading = -1 + 0j
-        score = max(
-            part1(
-                puzzle=puzzle,
-                start_position=(max_x + 1j * y),
-                start_heading=start_heading,
-            ),
-            score,
+
+
+class Contraption:
+    """The mirror grid, plus the beam paths between splitters
+
+    A beam only ever branches at the flat side of a splitter, and whichever
+    flat side it hits, the same two beams come out. So for every splitter we
+    trace its two outgoing beams once, note which tiles they light and which
+    splitters they run into, and from that work out every tile a splitter
+    eventually lights as a bitset. A beam coming in from the edge is then
+    one trace up to the first splitter plus that splitter's bitset.
+    """
+
+    def __init__(self, puzzle: str):
+        self.grid = Grid.from_text(puzzle)
+        self.own_tiles: dict[int, int] = {}
+        self.successors: dict[int, set[int]] = {}
+        for splitter in SPLITTERS:
+            for x, y in self.grid.positions(splitter):
+                index = y * self.grid.width + x
+                tiles = 1 << index
+                successors = set()
+                for bearing in SPLITTERS[splitter][1]:
+                    dx, dy = STEPS[bearing]
+                    beam_tiles, hit = self.trace(x + dx, y + dy, bearing)
+                    tiles |= beam_tiles
+                    if hit is not None:
+                        successors.add(hit)
+                self.own_tiles[index] = tiles
+                self.successors[index] = successors
+        self.reach = self._find_reach()
+
+    def trace(self, x: int, y: int, bearing: int) -> tuple[int, int | None]:
+        """Follow a beam entering (x, y) until it leaves or splits
+
+        Returns the tiles lit on the way as a bitset, and the index of the
+        splitter that split it (None if it left the grid).
+        """
+        width = self.grid.width
+        height = self.grid.height
+        data = self.grid.data
+        tiles = 0
+        seen = set()
+        while 0 <= x < width and 0 <= y < height:
+            index = y * width + x
+            if (index, bearing) in seen:
+                # going around in circles between mirrors
+                return tiles, None
+            seen.add((index, bearing))
+            tiles |= 1 << index
+            cell = data[index]
+            if cell in MIRRORS:
+                bearing = MIRRORS[cell][bearing]
+            elif cell in SPLITTERS and bearing in SPLITTERS[cell][0]:
+                return tiles, index
+            dx, dy = STEPS[bearing]
+            x += dx
+            y += dy
+        return tiles, None
+
+    def _find_reach(self) -> dict[int, int]:
+        """Every tile each splitter eventually lights
+
+        Splitters can feed each other in loops, so this goes through the
+        strongly connected components (Tarjan's algorithm, without the
+        recursion). Each component is finished only after everything it
+        leads to, so the bitsets can just be OR'ed together.
+        """
+        reach: dict[int, int] = {}
+        order: dict[int, int] = {}
+        low: dict[int, int] = {}
+        stack: list[int] = []
+        on_stack: set[int] = set()
+        for root in self.successors:
+            if root in order:
+                continue
+            order[root] = low[root] = len(order)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.successors[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in order:
+                        order[child] = low[child] = len(order)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.successors[child])))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], order[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] != order[node]:
+                        continue
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    tiles = 0
+                    for member in component:
+                        tiles |= self.own_tiles[member]
+                        for child in self.successors[member] - component:
+                            tiles |= reach[child]
+                    for member in component:
+                        reach[member] = tiles
+        return reach
+
+    def energized_tiles(self, x: int, y: int, bearing: int) -> int:
+        """Bitset of the tiles lit by a beam entering (x, y)"""
+        tiles, hit = self.trace(x, y, bearing)
+        if hit is not None:
+            tiles |= self.reach[hit]
+        return tiles
+
+    def energized(self, x: int, y: int, bearing: int) -> int:
+        return self.energized_tiles(x, y, bearing).bit_count()
+
+
+def edge_starts(width: int, height: int) -> list[tuple[int, int, int]]:
+    """Every way a beam can come in from the edge"""
+    return (
+        [(x, 0, SOUTH) for x in range(width)]
+        + [(x, height - 1, NORTH) for x in range(width)]
+        + [(0, y, EAST) for y in range(height)]
+        + [(width - 1, y, WEST) for y in range(height)]
+    )
+
+
+def part1(puzzle: str) -> int:
+    return Contraption(puzzle).energized(0, 0, EAST)
+
+
+_worker_contraption: Contraption | None = None
+
+
+def _start_worker(puzzle: str):
+    global _worker_contraption
+    _worker_contraption = Contraption(puzzle)
+
+
+def _best_start(starts: list[tuple[int, int, int]]) -> int:
+    return max((_worker_contraption.energized(*start) for start in starts), default=0)
+
+
+def part2(puzzle: str, workers: int | None = None) -> int:
+    """Find the starting position that gives the highest number of lit tiles
+
+    With workers, the edges are split up between that many processes (each
+    one works out the splitter bitsets for itself).
+    """
+    if not workers:
+        contraption = Contraption(puzzle)
+        return max(
+            contraption.energized(*start)
+            for start in edge_starts(contraption.grid.width, contraption.grid.height)
         )
-        print(y, score)
-    return score
+    lines = puzzle.splitlines()
+    starts = edge_starts(len(lines[0]), len(lines))
+    # no more chunks than starts, so none of them come out empty
+    workers = min(workers, len(starts))
+    chunks = [starts[index::workers] for index in range(workers)]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_start_worker,
+        initargs=(puzzle,),
+    ) as pool:
+        return max(pool.map(_best_start, chunks))
 
 
 def main():
+    real_input = load_input(16)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 46, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 51, part_2_result
     print("part 2: go")
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,7 @@
 """Day 18: lavaduct lagoon"""
-from collections import Counter
-from pathlib import Path
+from collections.abc import Iterable, Iterator
 
-import numpy as np
+from inputs import iter_lines, load_input
 
 TEST_INPUT = """R 6 (#70c710)
 D 5 (#0dc571)
@@ -19,75 +18,71 @@ U 3 (#a77fa3)
 L 2 (#015232)
 U 2 (#7a21e3)"""
 
-REAL_INPUT = Path("day18.txt").read_text()
-
-
-def part1(puzzle: str) -> int:
-    x = 0
-    y = 0
-    headings = {
-        "R": (1, 0),
-        "L": (-1, 0),
-        "D": (0, -1),
-        "U": (0, 1),
-    }
-    spots_filled = [(x, y)]
-    lines = puzzle.splitlines()
-    for line in lines:
+
+HEADINGS = {
+    "R": (1, 0),
+    "L": (-1, 0),
+    "D": (0, -1),
+    "U": (0, 1),
+}
+# the last digit of the colour in part 2
+HEX_DIRECTIONS = "RDLU"
+
+
+def plan_moves(puzzle: str | Iterable[str]) -> Iterator[tuple[str, int]]:
+    """The (direction, amount) of each instruction, as part 1 reads them"""
+    for line in iter_lines(puzzle):
         direction, amount, _ = line.split()
-        amount = int(amount)
-        dx, dy = headings[direction]
-        for _ in range(amount):
-            x += dx
-            y += dy
-            spots_filled.append((x, y))
-
-    area_contained = area(spots_filled)
-    return len(spots_filled) + (area_contained - len(spots_filled) // 2)
-
-
-def part2(puzzle: str) -> int:
-    x = 0
-    y = 0
-    headings = {
-        "0": (1, 0),  # right
-        "2": (-1, 0),  # left
-        "1": (0, -1),  # down
-        "3": (0, 1),  # up
-    }
-    spots_filled = [(x, y)]
-    lines = puzzle.splitlines()
-    number_of_points = 0
-    for line in lines:
+        yield direction, int(amount)
+
+
+def colour_moves(puzzle: str | Iterable[str]) -> Iterator[tuple[str, int]]:
+    """The (direction, amount) hidden in each colour, as part 2 reads them"""
+    for line in iter_lines(puzzle):
         instr = line.split()[-1][2:-1]
         assert len(instr) == 6, instr
-        direction = instr[-1]
-        amount = int(instr[:-1], 16)
-        dx, dy = headings[direction]
-        # print(dx, dy, amount)
+        yield HEX_DIRECTIONS[int(instr[-1])], int(instr[:-1], 16)
+
+
+def lagoon_size(moves: Iterable[tuple[str, int]]) -> int:
+    """How many cubic metres the trench and its inside hold
+
+    Goes round the trench a corner at a time, keeping a running shoelace sum
+    (twice the area, in python ints so it's exact however big it gets) and
+    the perimeter. Pick's theorem gives the squares strictly inside from
+    those, and the trench itself is one square per unit of perimeter.
+    """
+    x = y = 0
+    twice_area = 0
+    perimeter = 0
+    for direction, amount in moves:
+        dx, dy = HEADINGS[direction]
+        next_x = x + dx * amount
+        next_y = y + dy * amount
+        twice_area += x * next_y - next_x * y
+        perimeter += amount
+        x, y = next_x, next_y
+    assert x == y == 0, "the trench doesn't loop back to the start"
+    inside = (abs(twice_area) - perimeter) // 2 + 1
+    return inside + perimeter
+
 
-        x += dx * amount
-        y += dy * amount
-        spots_filled.append((x, y))
-        number_of_points += amount
-    area_contained = area(spots_filled)
-    return area_contained - number_of_points // 2 + number_of_points + 1
+def part1(puzzle: str | Iterable[str]) -> int:
+    return lagoon_size(plan_moves(puzzle))
 
 
-# https://stackoverflow.com/a/30408825
-def area(vertices: list[tuple[int, int]]):
-    x = [i[0] for i in vertices]
-    y = [i[1] for i in vertices]
-    return 0.5 * np.abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+def part2(puzzle: str | Iterable[str]) -> int:
+    return lagoon_size(colour_moves(puzzle))
 
 
 def main():
+    real_input = load_input(18)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 62, part_1_result
-    print(round(part1(REAL_INPUT)))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 952408144115, part_2_result
-    print(round(part2(REAL_INPUT)))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 """day 19: aplenty"""
-from pathlib import Path
-from math import prod
+import re
+from collections.abc import Callable
 from dataclasses import dataclass
-from time import perf_counter
+from functools import cache
+from math import prod
 
-from intervaltree import Interval, IntervalTree
+import numpy as np
 
-from day19_generated import in_
+from inputs import load_input
 
 TEST_INPUT = """px{a<2006:qkq,m>2090:A,rfg}
 pv{a>1716:R,A}
@@ -26,8 +27,6 @@ hdj{m>838:A,pv}
 {x=2461,m=1339,a=466,s=291}
 {x=2127,m=1623,a=2188,s=1013}"""
 
-REAL_INPUT = Path("day19.txt").read_text()
-
 
 @dataclass
 class Part:
@@ -49,97 +48,65 @@ class Workflow:
     name: str
     conditions: list[str]
 
+    @staticmethod
+    def function_name(name: str) -> str:
+        """What the workflow's function is called (the names include "in")"""
+        return f"workflow_{name}"
+
     def to_python(self) -> str:
-        """Convert the instructions into a python function"""
-        func_name = self.name if self.name != "in" else "in_"
-        output = [f"def {func_name}(part) -> str:"]
+        """Convert the instructions into a python function
+
+        The function takes the part's x, m, a, s ratings and returns "A" or
+        "R", calling the next workflow's function along the way.
+        """
+        output = [f"def {self.function_name(self.name)}(x, m, a, s) -> str:"]
         for instruction in self.conditions:
             if ":" not in instruction:
                 if instruction in "AR":
                     output.append(f'    return "{instruction}"')
                 else:
-                    output.append(f"    return {instruction}(part)")
+                    output.append(
+                        f"    return {self.function_name(instruction)}(x, m, a, s)"
+                    )
                 continue
             condition, destination = instruction.split(":")
             if "<" in condition:
                 attr, amount = condition.split("<")
                 amount = int(amount)
                 output.append(
-                    f"    if part.{attr} < {amount}:",
+                    f"    if {attr} < {amount}:",
                 )
             elif ">" in condition:
                 attr, amount = condition.split(">")
                 amount = int(amount)
                 output.append(
-                    f"    if part.{attr} < {amount}:",
+                    f"    if {attr} > {amount}:",
                 )
             else:
                 raise ValueError(f"unknown instruction {instruction}")
             if destination in "AR":
                 output.append(f'        return "{destination}"')
             else:
-                output.append(f"        return {destination}(part)")
+                output.append(
+                    f"        return {self.function_name(destination)}(x, m, a, s)"
+                )
         return "\n".join(output)
 
-    @property
-    def boundaries(self) -> dict[str, list[int]]:
-        """find all the decision points in this workflow"""
-        result = {
-            "x": [],
-            "m": [],
-            "a": [],
-            "s": [],
-        }
-        for instruction in self.conditions:
-            # print('instruction', instruction)
-            if ":" not in instruction:
-                continue
-            condition, destination = instruction.split(":")
-            if "<" in condition:
-                attr, amount = condition.split("<")
-                amount = int(amount)
-                result[attr].append(amount)
-            elif ">" in condition:
-                attr, amount = condition.split(">")
-                amount = int(amount)
-                result[attr].append(amount + 1)
-            else:
-                raise ValueError(f"unknown instruction {instruction}")
-        return {key: sorted(val) for key, val in result.items()}
-
-    def run_through_workflow(self, part: Part) -> str:
-        """Run the part through the workflow
 
-        Returns A, R, or the name of a new workflow
-        """
-        # print('running part', part, 'through', self.name)
-        for instruction in self.conditions:
-            # print('instruction', instruction)
-            if ":" not in instruction:
-                # the end
-                # print('end', instruction)
-                return instruction
-            condition, destination = instruction.split(":")
-            if "<" in condition:
-                attr, amount = condition.split("<")
-                amount = int(amount)
-                if getattr(part, attr) < amount:
-                    # print('<', amount, True)
-                    return destination
-                # print('<', amount, False)
-            elif ">" in condition:
-                attr, amount = condition.split(">")
-                amount = int(amount)
-                if getattr(part, attr) > amount:
-                    # print('>', amount, True)
-                    return destination
-                # print('>', amount, False)
-            else:
-                raise ValueError(f"unknown instruction {instruction}")
+def parse_workflows(raw_flows: str) -> list[Workflow]:
+    workflows = []
+    for f in raw_flows.splitlines():
+        name, instructions = f[:-1].split("{")
+        workflows.append(
+            Workflow(
+                name=name,
+                conditions=instructions.split(","),
+            ),
+        )
+    return workflows
 
 
-def parse_input(puzzle: str) -> tuple[list[Workflow], list[Part]]:
-    raw_flows, raw_parts = puzzle.split("\n\n")
+def parse_parts(raw_parts: str) -> list[Part]:
     parts = []
     for p in raw_parts.splitlines():
         # print(p)
@@ -155,124 +122,153 @@ def parse_input(puzzle: str) -> tuple[list[Workflow], list[Part]]:
             part_dict[attr] = int(val)
         # print(part_dict)
         parts.append(Part(**part_dict))
-    workflows = []
-    for f in raw_flows.splitlines():
-        name, instructions = f[:-1].split("{")
-        workflows.append(
-            Workflow(
-                name=name,
-                conditions=instructions.split(","),
-            ),
-        )
-    return workflows, parts
+    return parts
 
 
-def part1(puzzle: str) -> int:
-    workflows, parts = parse_input(puzzle)
-    score = 0
-    flows = {flow.name: flow for flow in workflows}
-    for part in parts:
-        # print(part)
-        flow = flows["in"]
-        flow_name = flow.name
-        while True:
-            flow_name = flow.run_through_workflow(part)
-            # print(flow_name)
-            try:
-                flow = flows[flow_name]
-            except KeyError:
-                break
-        if flow_name == "A":
-            # print('accepted', part)
-            score += part.score
-        # else:
-        #     print('rejected', part)
-    return score
+def parse_input(puzzle: str) -> tuple[list[Workflow], list[Part]]:
+    raw_flows, raw_parts = puzzle.split("\n\n")
+    return parse_workflows(raw_flows), parse_parts(raw_parts)
 
 
-def part2(puzzle: str) -> int:
-    """How many possible workflows can be accepted?"""
-    workflows, _ = parse_input(puzzle)
+@cache
+def compile_workflows(raw_flows: str) -> Callable[[int, int, int, int], str]:
+    """Compile the workflows into python functions, returning the "in" one
 
-    accepted = 0
-    intervals = {
-        "x": IntervalTree([Interval(1, 4001)]),
-        "m": IntervalTree([Interval(1, 4001)]),
-        "a": IntervalTree([Interval(1, 4001)]),
-        "s": IntervalTree([Interval(1, 4001)]),
-    }
-    for workflow in workflows:
-        boundaries = workflow.boundaries
-        for attr, interval in intervals.items():
-            for boundary in boundaries[attr]:
-                interval.slice(boundary)
-    # print(intervals)
-
-    print("waiting")
-    print(
-        {key: len(val) for key, val in intervals.items()},
-        prod(len(i) for i in intervals.values()),
+    This is the code that used to be written out to a separate module by
+    hand, only built in memory now. Compiling is remembered per set of
+    workflows, so sorting more parts with the same ones is free.
+    """
+    workflows = parse_workflows(raw_flows)
+    source = "\n\n".join(workflow.to_python() for workflow in workflows)
+    namespace = {}
+    exec(compile(source, "<day 19 workflows>", "exec"), namespace)
+    return namespace[Workflow.function_name("in")]
+
+
+def part1(puzzle: str) -> int:
+    raw_flows, raw_parts = puzzle.split("\n\n")
+    in_ = compile_workflows(raw_flows)
+    parts = parse_parts(raw_parts)
+    return sum(
+        part.score for part in parts if in_(part.x, part.m, part.a, part.s) == "A"
     )
-    accepted = 0
-    x_done = 0
-    for x_interval in intervals["x"]:
-        m_done = 0
-        for m_interval in intervals["m"]:
-            before = perf_counter()
-            for a_interval in intervals["a"]:
-                accepted += do_part_2(
-                    x_interval.begin,
-                    x_interval.end,
-                    m_interval.begin,
-                    m_interval.end,
-                    a_interval.begin,
-                    a_interval.end,
-                    intervals["s"],
-                )
-            after = perf_counter()
-            m_done += 1
-            print(x_done, m_done, accepted, after - before, end="\r")
-        x_done += 1
-    print("")
+
+
+RATING = re.compile(r"\d+")
+XMAS = "xmas"
+
+
+def parse_ratings(raw_parts: str) -> np.ndarray:
+    """All the parts as one array, a row of x, m, a, s per part"""
+    return np.array(RATING.findall(raw_parts), dtype=np.int64).reshape(-1, len(XMAS))
+
+
+def classify(workflows: list[Workflow], ratings: np.ndarray) -> np.ndarray:
+    """Which of the parts (rows of x, m, a, s) get accepted, all at once
+
+    Rather than sending each part through on its own, every workflow takes
+    the indexes of all the parts that reached it, and splits them up between
+    its destinations one condition at a time.
+    """
+    flows = {flow.name: flow for flow in workflows}
+    accepted = np.zeros(len(ratings), dtype=bool)
+    pending = [("in", np.arange(len(ratings)))]
+    while pending:
+        name, indexes = pending.pop()
+        if name == "A":
+            accepted[indexes] = True
+            continue
+        if name == "R" or not len(indexes):
+            continue
+        for instruction in flows[name].conditions:
+            if ":" not in instruction:
+                pending.append((instruction, indexes))
+                break
+            condition, destination = instruction.split(":")
+            attr, comparison, amount = condition[0], condition[1], int(condition[2:])
+            values = ratings[indexes, XMAS.index(attr)]
+            if comparison == "<":
+                matches = values < amount
+            elif comparison == ">":
+                matches = values > amount
+            else:
+                raise ValueError(f"unknown instruction {instruction}")
+            pending.append((destination, indexes[matches]))
+            indexes = indexes[~matches]
     return accepted
 
 
-def do_part_2(
-    x_min,
-    x_max,
-    m_min,
-    m_max,
-    a_min,
-    a_max,
-    s_intervals,
+def part1_batch(puzzle: str) -> int:
+    """part1, but sorting every part in one go with numpy"""
+    raw_flows, raw_parts = puzzle.split("\n\n")
+    ratings = parse_ratings(raw_parts)
+    accepted = classify(parse_workflows(raw_flows), ratings)
+    return int(ratings[accepted].sum())
+
+
+def accepted_combinations(
+    workflows: list[Workflow],
+    lowest: int = 1,
+    highest: int = 4000,
 ) -> int:
+    """How many combinations of ratings between lowest and highest get accepted
+
+    Instead of trying parts, this sends boxes of them through the workflows:
+    each box is a half-open range per rating, and it only gets split in two
+    when a condition actually cuts through it. Whatever reaches A counts in
+    full.
+    """
+    flows = {flow.name: flow for flow in workflows}
     accepted = 0
-    for interval in s_intervals:
-        s_min = interval.begin
-        s_max = interval.end
-        part = Part(
-            x=x_min,
-            m=m_min,
-            a=a_min,
-            s=s_min,
-        )
-        result = in_(part)
-        if result == "A":
-            interval_size = (
-                (x_max - x_min) * (m_max - m_min) * (a_max - a_min) * (s_max - s_min)
-            )
-            accepted += interval_size
+    pending = [("in", {attr: (lowest, highest + 1) for attr in XMAS})]
+    while pending:
+        name, box = pending.pop()
+        if name == "A":
+            accepted += prod(end - start for start, end in box.values())
+            continue
+        if name == "R":
+            continue
+        for instruction in flows[name].conditions:
+            if ":" not in instruction:
+                pending.append((instruction, box))
+                break
+            condition, destination = instruction.split(":")
+            attr, comparison, amount = condition[0], condition[1], int(condition[2:])
+            start, end = box[attr]
+            if comparison == "<":
+                matched = (start, min(end, amount))
+                rest = (max(start, amount), end)
+            elif comparison == ">":
+                matched = (max(start, amount + 1), end)
+                rest = (start, min(end, amount + 1))
+            else:
+                raise ValueError(f"unknown instruction {instruction}")
+            if matched[0] < matched[1]:
+                pending.append((destination, box | {attr: matched}))
+            if rest[0] >= rest[1]:
+                # nothing left for the rest of the workflow
+                break
+            box = box | {attr: rest}
     return accepted
 
 
+def part2(puzzle: str, lowest: int = 1, highest: int = 4000) -> int:
+    """How many possible workflows can be accepted?"""
+    raw_flows, _ = puzzle.split("\n\n")
+    return accepted_combinations(parse_workflows(raw_flows), lowest, highest)
+
+
 def main():
+    real_input = load_input(19)
     part_1_score = part1(TEST_INPUT)
     assert part_1_score == 19114, part_1_score
-    print(part1(REAL_INPUT))
-    # part_2_score = part2(TEST_INPUT)
-    # assert part_2_score == 167409079868000, part_2_score
+    part_1_batch_score = part1_batch(TEST_INPUT)
+    assert part_1_batch_score == 19114, part_1_batch_score
+    print(part1(real_input))
+    part_2_score = part2(TEST_INPUT)
+    assert part_2_score == 167409079868000, part_2_score
     print("part 2: go")
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,8 @@
-from pathlib import Path
 from enum import Enum
 from collections import deque
 from math import lcm
 
-REAL_INPUT = Path("day20.txt").read_text()
+from inputs import load_input
 
 TEST_INPUT = """broadcaster -> a
 %a -> inv, con
@@ -197,11 +196,12 @@ def part2(puzzle: str) -> int:
 
 
 def main():
+    real_input = load_input(20)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 4250 * 2750, part_1_result
     # this helped me see what was going on
     # output = ["digraph {"]
-    # for line in REAL_INPUT.splitlines():
+    # for line in real_input.splitlines():
     #     output.append(
     #         " " * 4
     #         + (
@@ -217,8 +217,8 @@ def main():
     #     )
     # output.append("}")
     # Path("day20-viz.txt").write_text("\n".join(output))
-    print(part1(REAL_INPUT))
-    print(part2(REAL_INPUT))
+    print(part1(real_input))
+    print(part2(real_input))
 
 
 class EndOfTheSim(Exception):
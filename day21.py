@@ -1,6 +1,6 @@
 """Day 21: step counter"""
-import heapq
-from pathlib import Path
+from grid import Grid
+from inputs import load_input
 
 
 TEST_INPUT = """...........
@@ -15,54 +15,44 @@ TEST_INPUT = """...........
 .##..##.##.
 ..........."""
 
-REAL_INPUT = Path("day21.txt").read_text()
-
-
-def parse_input(
-    puzzle: str,
-) -> tuple[dict[tuple[int, int], str], tuple[int, int]]:
-    grid = {}
-    start = None
-    for y, row in enumerate(puzzle.splitlines()):
-        for x, char in enumerate(row):
-            if char == "S":
-                grid[x, y] = "."
-                start = (x, y)
-            else:
-                grid[x, y] = char
+
+GARDEN = ord(".")
+
+
+def parse_input(puzzle: str, wrap: bool = False) -> tuple[Grid, tuple[int, int]]:
+    grid = Grid.from_text(puzzle, wrap=wrap)
+    start = grid.find(ord("S"))
+    grid[start] = GARDEN
     return grid, start
 
 
+def take_step(grid: Grid, spots: set[tuple[int, int]]) -> set[tuple[int, int]]:
+    """Find every garden spot one step away from any of the given spots
+
+    Since we're only ever asked about an exact number of steps, all we need
+    to carry from one step to the next is where we could be right now.
+    """
+    width = grid.width
+    height = grid.height
+    data = grid.data
+    new_spots = set()
+    for x, y in spots:
+        for x1, y1 in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if grid.wrap:
+                if data[(y1 % height) * width + x1 % width] == GARDEN:
+                    new_spots.add((x1, y1))
+            elif 0 <= x1 < width and 0 <= y1 < height:
+                if data[y1 * width + x1] == GARDEN:
+                    new_spots.add((x1, y1))
+    return new_spots
+
+
 def part1(puzzle: str, number_of_steps: int = 64) -> int:
-    grid, (x, y) = parse_input(puzzle)
-    last_steps_taken = 0
-    spots_seen_this_round = set()
-    queue = [
-        (0, (x, y)),
-    ]
-    heapq.heapify(queue)
-    while True:
-        last_steps, (x, y) = heapq.heappop(queue)
-        if last_steps == number_of_steps:
-            # this is our first time at the target
-            # since we've filtered for dupes, we should be
-            # good to just return the size of the queue at
-            # this point but have to include the 1 we just
-            # popped
-            return len(queue) + 1
-        if last_steps != last_steps_taken:
-            # reset
-            last_steps_taken = last_steps
-            spots_seen_this_round = set()
-            print(f"now at {last_steps}, queue size {len(queue)}")
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            x1 = x + dx
-            y1 = y + dy
-            if (x1, y1) not in spots_seen_this_round and grid.get(
-                (x1, y1),
-            ) == ".":
-                heapq.heappush(queue, (last_steps + 1, (x1, y1)))
-                spots_seen_this_round.add((x1, y1))
+    grid, start = parse_input(puzzle)
+    spots = {start}
+    for _ in range(number_of_steps):
+        spots = take_step(grid, spots)
+    return len(spots)
 
 
 def part2(puzzle: str, number_of_steps: int = 26501365) -> int:
@@ -80,50 +70,30 @@ def part2(puzzle: str, number_of_steps: int = 26501365) -> int:
 
 
 def part_2_internal(puzzle: str, number_of_steps: int) -> list[int]:
-    grid, (x, y) = parse_input(puzzle)
-    max_x, max_y = max(grid)
-    max_x += 1
-    max_y += 1
-    last_steps_taken = 0
-    spots_seen_this_round = set()
+    grid, start = parse_input(puzzle, wrap=True)
+    max_x = grid.width
     done: list[int] = []
-    queue = [
-        (0, (x, y)),
-    ]
-    heapq.heapify(queue)
-    while True:
-        last_steps, (x, y) = heapq.heappop(queue)
-
-        if last_steps == number_of_steps:
-            return done
-        if last_steps != last_steps_taken:
-            # reset
-            if last_steps % max_x == 65:
-                # save our progress
-                done.append(len(queue) + 1)
-                print("saved!", done)
-                if len(done) == 3:
-                    return done
-            last_steps_taken = last_steps
-            spots_seen_this_round = set()
-            print(f"now at {last_steps}, queue size {len(queue)}")
-
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            x1 = x + dx
-            y1 = y + dy
-            if (x1, y1) not in spots_seen_this_round and grid.get(
-                (x1 % max_x, y1 % max_y)
-            ) == ".":
-                heapq.heappush(queue, (last_steps + 1, (x1, y1)))
-                spots_seen_this_round.add((x1, y1))
+    spots = {start}
+    for steps in range(1, number_of_steps + 1):
+        spots = take_step(grid, spots)
+        # S sits in the middle of the grid, so this is every time we've just
+        # reached the edge of another copy of the garden (65 for my 131)
+        if steps % max_x == max_x // 2:
+            # save our progress
+            done.append(len(spots))
+            print("saved!", done)
+            if len(done) == 3:
+                return done
+    return done
 
 
 def main():
+    real_input = load_input(21)
     part_1_result = part1(TEST_INPUT, 6)
     assert part_1_result == 16, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
 
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,8 @@
 """Day 22: sand slabs"""
 
-from pathlib import Path
-
 import networkx
 
+from inputs import load_input
 
 TEST_INPUT = """1,0,1~1,2,1
 0,0,2~2,0,2
@@ -13,8 +12,6 @@ TEST_INPUT = """1,0,1~1,2,1
 0,1,6~2,1,6
 1,1,8~1,1,9"""
 
-REAL_INPUT = Path("day22.txt").read_text()
-
 
 def parse_input(puzzle: str) -> list[tuple[tuple[int, int, int], tuple[int, int, int]]]:
     """Convert the puzzle into a list of 3D blocks"""
@@ -91,7 +88,7 @@ def part1(puzzle: str) -> tuple[int, int]:
 
 
 def make_fall(
-    blocks: list[tuple[tuple[int, int, int], tuple[int, int, int]]]
+    blocks: list[tuple[tuple[int, int, int], tuple[int, int, int]]],
 ) -> list[tuple[tuple[int, int, int], tuple[int, int, int]]]:
     """Make the blocks fall!"""
     occupied_blocks: set[tuple[int, int, int]] = set()
@@ -145,9 +142,10 @@ def make_fall(
 
 
 def main():
+    real_input = load_input(22)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == (5, 7), part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
 
 
 if __name__ == "__main__":
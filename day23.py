@@ -1,8 +1,9 @@
 """Day 23: let's go for a hike"""
 
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
-import networkx
+from grid import Grid
+from inputs import load_input
 
 TEST_INPUT = """#.#####################
 #.......#########...###
@@ -28,123 +29,241 @@ TEST_INPUT = """#.#####################
 #.....###...###...#...#
 #####################.#"""
 
-REAL_INPUT = Path("day23.txt").read_text()
-
-
-def parse_input(
-    puzzle: str,
-) -> tuple[networkx.DiGraph, tuple[int, int], tuple[int, int]]:
-    graph = networkx.DiGraph()
-    lines = puzzle.splitlines()
-    for y, row in enumerate(lines):
-        for x, char in enumerate(row):
-            if char == ".":
-                last_pos = (x, y)
-                if not y:
-                    start = last_pos
-                for dx, dy in [(1, 0), (-1, 0), (0, -1), (0, 1)]:
-                    try:
-                        neighbor = lines[y + dy][x + dx]
-                    except IndexError:
-                        continue
-                    if neighbor == ".":
-                        # add edges in both directions
-                        graph.add_edge(
-                            (x, y),
-                            (x + dx, y + dy),
-                        )
-                        graph.add_edge(
-                            (x, y),
-                            (x + dx, y + dy),
-                        )
-                    elif neighbor in "<>^v":
-                        # it's a slope
-                        # only add the inbound connection
-                        # we'll deal with the outbound connection below
-                        invalid_step = {
-                            ">": (-1, 0),  # can't walk uphill
-                            "<": (1, 0),
-                            "^": (0, 1),
-                            "v": (0, -1),
-                        }[neighbor]
-                        if (dx, dy) != invalid_step:
-                            graph.add_edge(
-                                (x, y),
-                                (x + dx, y + dy),
+
+PATH = ord(".")
+FOREST = ord("#")
+# which way each slope sends you
+SLOPES = {
+    ord(">"): (1, 0),
+    ord("<"): (-1, 0),
+    ord("v"): (0, 1),
+    ord("^"): (0, -1),
+}
+
+
+class HikingMap:
+    """The trails boiled down to the junctions and the corridors between them
+
+    Nearly every open tile is a corridor with only one way on, so the only
+    places a hike can actually choose anything are the junctions (plus the
+    start and the end). The junctions are numbered from 0, and edges[node]
+    lists (next junction, steps) for every corridor leaving it. With
+    slippery=True the slopes can only be walked downhill, so some corridors
+    only go one way.
+    """
+
+    def __init__(self, puzzle: str, slippery: bool = True):
+        grid = Grid.from_text(puzzle)
+        self.slippery = slippery
+        start = (grid.row(0).tobytes().index(PATH), 0)
+        end = (grid.row(grid.height - 1).tobytes().index(PATH), grid.height - 1)
+        junctions = [start]
+        for y in range(grid.height):
+            for x in range(grid.width):
+                if grid[x, y] != FOREST and len(self._exits(grid, x, y)) > 2:
+                    junctions.append((x, y))
+        junctions.append(end)
+        self.junctions = junctions
+        self.start = 0
+        self.end = len(junctions) - 1
+        node_ids = {position: node for node, position in enumerate(junctions)}
+        self.edges: list[list[tuple[int, int]]] = []
+        for x, y in junctions:
+            edges = []
+            for dx, dy in self._exits(grid, x, y):
+                corridor = self._follow(grid, x, y, dx, dy, node_ids)
+                if corridor is not None:
+                    edges.append(corridor)
+            self.edges.append(edges)
+        into_end = [
+            node
+            for node, edges in enumerate(self.edges)
+            for edge in edges
+            if edge[0] == self.end
+        ]
+        if len(into_end) == 1:
+            # once we're at the last junction before the end, going anywhere
+            # else means we can never get there
+            last = into_end[0]
+            self.edges[last] = [
+                edge for edge in self.edges[last] if edge[0] == self.end
+            ]
+        # the longest corridor into each junction, for bounding the search
+        self.best_in = [0] * len(junctions)
+        for edges in self.edges:
+            for node, steps in edges:
+                self.best_in[node] = max(self.best_in[node], steps)
+
+    @staticmethod
+    def _exits(grid: Grid, x: int, y: int) -> list[tuple[int, int]]:
+        """Which ways we could step off (x, y) onto a trail"""
+        return [
+            (x1 - x, y1 - y)
+            for x1, y1 in grid.neighbors(x, y)
+            if grid[x1, y1] != FOREST
+        ]
+
+    def _can_step(self, here: int, there: int, dx: int, dy: int) -> bool:
+        if not self.slippery:
+            return True
+        if here in SLOPES and SLOPES[here] != (dx, dy):
+            # a slope only lets you off downhill
+            return False
+        # and you can't walk onto one uphill
+        return SLOPES.get(there) != (-dx, -dy)
+
+    def _follow(
+        self,
+        grid: Grid,
+        x: int,
+        y: int,
+        dx: int,
+        dy: int,
+        node_ids: dict[tuple[int, int], int],
+    ) -> tuple[int, int] | None:
+        """Walk the corridor leaving (x, y) in direction (dx, dy)
+
+        Returns the junction at the other end and how many steps it took, or
+        None for a dead end or a corridor that's uphill this way.
+        """
+        steps = 0
+        while True:
+            if not self._can_step(grid[x, y], grid[x + dx, y + dy], dx, dy):
+                return None
+            x += dx
+            y += dy
+            steps += 1
+            if (x, y) in node_ids:
+                return node_ids[x, y], steps
+            onward = [exit for exit in self._exits(grid, x, y) if exit != (-dx, -dy)]
+            if not onward:
+                return None
+            dx, dy = onward[0]
+
+    def branches(self, count: int) -> list[tuple[int, int, int, int]]:
+        """Split the search into at least count separate partial hikes
+
+        Each one is (junction, visited junctions as a bitmask, steps so far,
+        the most steps the unvisited junctions could still add), ready to be
+        handed to search().
+        """
+        hikes = [
+            (
+                self.start,
+                1 << self.start,
+                0,
+                sum(self.best_in) - self.best_in[self.start],
+            )
+        ]
+        while len(hikes) < count:
+            longer = []
+            for node, visited, length, remaining in hikes:
+                if node == self.end:
+                    longer.append((node, visited, length, remaining))
+                    continue
+                for neighbor, steps in self.edges[node]:
+                    if not visited >> neighbor & 1:
+                        longer.append(
+                            (
+                                neighbor,
+                                visited | 1 << neighbor,
+                                length + steps,
+                                remaining - self.best_in[neighbor],
                             )
-            elif char in "^>v<":
-                dx, dy = {
-                    ">": (1, 0),
-                    "<": (-1, 0),
-                    "v": (0, 1),
-                    "^": (0, -1),
-                }[char]
-                assert lines[y + dy][x + dx] in "^.<>v"
-                graph.add_edge(
-                    (x, y),
-                    (x + dx, y + dy),
-                )
-
-    return graph, start, last_pos
-
-
-def part1(puzzle: str) -> int:
-    """Find the longest path from start to end that doesn't involve backtracking"""
-    grid, start, end = parse_input(puzzle=puzzle)
-    paths = networkx.all_simple_paths(grid, start, end)
-    lengths = [len(path) for path in paths]
-    print(lengths)
-    return max(lengths) - 1  # networkx includes an extra step on each path
-
-
-def parse_input_p2(
-    puzzle: str,
-) -> tuple[networkx.Graph, tuple[int, int], tuple[int, int]]:
-    graph = networkx.Graph()
-    lines = puzzle.splitlines()
-    for y, row in enumerate(lines):
-        for x, char in enumerate(row):
-            if char in ".<>v^":
-                last_pos = (x, y)
-                if not y:
-                    start = last_pos
-                for dx, dy in [(1, 0), (-1, 0), (0, -1), (0, 1)]:
-                    try:
-                        neighbor = lines[y + dy][x + dx]
-                    except IndexError:
-                        continue
-                    if neighbor in "<>^v.":
-                        graph.add_edge(
-                            (x, y),
-                            (x + dx, y + dy),
                         )
+            if len(longer) <= len(hikes):
+                # not branching out any more
+                return longer
+            hikes = longer
+        return hikes
 
-    return graph, start, last_pos
+    def search(
+        self,
+        node: int,
+        visited: int,
+        length: int,
+        remaining: int,
+        best: int = -1,
+    ) -> int:
+        """The longest hike to the end carrying on from node, if it beats best
+
+        Gives up on a branch as soon as even taking the longest corridor into
+        every unvisited junction couldn't beat the best hike found so far.
+        Returns best unchanged if nothing does better.
+        """
+        if node == self.end:
+            return max(best, length)
+        for neighbor, steps in self.edges[node]:
+            if visited >> neighbor & 1:
+                continue
+            left = remaining - self.best_in[neighbor]
+            if length + steps + left <= best:
+                continue
+            best = self.search(
+                neighbor, visited | 1 << neighbor, length + steps, left, best
+            )
+        return best
+
+
+_worker_map: HikingMap | None = None
+
+
+def _start_worker(puzzle: str, slippery: bool):
+    global _worker_map
+    _worker_map = HikingMap(puzzle, slippery=slippery)
+
+
+def _longest_branch(hikes: list[tuple[int, int, int, int]]) -> int:
+    best = -1
+    for hike in hikes:
+        best = _worker_map.search(*hike, best=best)
+    return best
+
+
+def longest_hike(puzzle: str, slippery: bool, workers: int | None = None) -> int:
+    """Length of the longest hike from start to end without revisiting a tile
+
+    With workers, the first few junctions' worth of choices are split up
+    between that many processes.
+    """
+    hiking_map = HikingMap(puzzle, slippery=slippery)
+    if not workers:
+        best = hiking_map.search(*hiking_map.branches(1)[0])
+    else:
+        hikes = hiking_map.branches(workers * 4)
+        chunks = [hikes[index::workers] for index in range(workers)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_start_worker,
+            initargs=(puzzle, slippery),
+        ) as pool:
+            best = max(pool.map(_longest_branch, chunks))
+    if best < 0:
+        raise ValueError("Never made it!")
+    return best
+
+
+def part1(puzzle: str, workers: int | None = None) -> int:
+    """Find the longest path from start to end that doesn't involve backtracking"""
+    return longest_hike(puzzle, slippery=True, workers=workers)
 
 
-def part2(puzzle: str) -> int:
+def part2(puzzle: str, workers: int | None = None) -> int:
     """Find the longest path from start to end that doesn't involve backtracking
 
     Only this time, ignoring slopes (so extra long)
     """
-    grid, start, end = parse_input_p2(puzzle=puzzle)
-    paths = networkx.all_simple_paths(grid, start, end)
-    max_length = 0
-    for path in paths:
-        new_length = len(path)
-        if new_length > max_length:
-            print(new_length, end="\r")
-            max_length = new_length
-    return max_length - 1  # networkx includes an extra step on each path
+    return longest_hike(puzzle, slippery=False, workers=workers)
 
 
 def main():
+    real_input = load_input(23)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 94, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 154, part_2_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
@@ -2,18 +2,18 @@
 import decimal
 from dataclasses import dataclass
 from itertools import combinations
-from pathlib import Path
 from typing import Self
 
 import numpy as np
 
+from inputs import load_input
+
 TEST_INPUT = """19, 13, 30 @ -2,  1, -2
 18, 19, 22 @ -1, -1, -2
 20, 25, 34 @ -2, -2, -4
 12, 31, 28 @ -1, -2, -1
 20, 19, 15 @  1, -5, -3"""
 
-REAL_INPUT = Path("day24.txt").read_text()
 decimal.getcontext().prec = 50
 
 
@@ -127,7 +127,11 @@ def parse_input(puzzle: str) -> list[Hailstone]:
     ]
 
 
-def part1(puzzle: str, min_xy: int, max_xy: int) -> int:
+def part1(
+    puzzle: str,
+    min_xy: int = 200000000000000,
+    max_xy: int = 400000000000000,
+) -> int:
     """Find all intersections of nodes in the area"""
     stones = parse_input(puzzle=puzzle)
     intersections = 0
@@ -215,12 +219,13 @@ def part2(puzzle: str) -> int:
 
 
 def main():
+    real_input = load_input(24)
     part_1_result = part1(TEST_INPUT, 7, 27)
     assert part_1_result == 2, part_1_result
-    print(part1(REAL_INPUT, 200000000000000, 400000000000000))
+    print(part1(real_input))
     part_2_result = part2(TEST_INPUT)
     assert part_2_result == 47, part_2_result
-    print(part2(REAL_INPUT))
+    print(part2(real_input))
 
 
 if __name__ == "__main__":
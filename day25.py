@@ -1,9 +1,8 @@
 """Day 25: cut the wires!"""
 
-from pathlib import Path
-from itertools import combinations
+from collections import defaultdict, deque
 
-import networkx
+from inputs import load_input
 
 TEST_INPUT = """jqt: rhn xhk nvd
 rsh: frs pzl lsr
@@ -20,62 +19,81 @@ rzs: qnr cmg lsr rsh
 frs: qnr lhk lsr"""
 
 
-REAL_INPUT = Path("day25.txt").read_text()
-
-
-def parse_input(puzzle: str) -> networkx.Graph:
-    graph = networkx.Graph()
+def parse_input(puzzle: str) -> dict[str, set[str]]:
+    """Each component and the components it's wired to (both ways round)"""
+    graph: dict[str, set[str]] = defaultdict(set)
     for line in puzzle.splitlines():
         source, targets = line.split(": ")
         for target in targets.split():
-            graph.add_edge(source, target)
+            graph[source].add(target)
+            graph[target].add(source)
     return graph
 
 
-def graph_to_dot(graph: networkx.Graph) -> str:
+def graph_to_dot(graph: dict[str, set[str]]) -> str:
     output = ["graph {"]
-    for node1, node2 in graph.edges:
-        output.append(f"    {node1} -- {node2}")
+    for node1, neighbors in graph.items():
+        for node2 in neighbors:
+            if node1 < node2:
+                output.append(f"    {node1} -- {node2}")
     output.append("}")
     return "\n".join(output)
 
 
-def part1(puzzle: str) -> None:
+def source_side(
+    graph: dict[str, set[str]], source: str, sink: str, wires: int
+) -> set[str] | None:
+    """The components left with source when cutting wires wires parts it from sink
+
+    Finds edge-disjoint paths from source to sink one at a time (shortest
+    augmenting paths, every wire carrying at most one path). If there are
+    exactly `wires` of them, whatever the next search can still reach is
+    source's side of the cut. Returns None if sink is on the same side (or
+    the two are parted by fewer wires).
+    """
+    # (a, b) in flow means a path goes along the wire from a to b
+    flow: set[tuple[str, str]] = set()
+    for paths in range(wires + 1):
+        parents: dict[str, str | None] = {source: None}
+        queue = deque([source])
+        while queue and sink not in parents:
+            node = queue.popleft()
+            for neighbor in graph[node]:
+                if neighbor not in parents and (node, neighbor) not in flow:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
+        if sink not in parents:
+            return set(parents) if paths == wires else None
+        node = sink
+        while (parent := parents[node]) is not None:
+            if (node, parent) in flow:
+                # sending it back the other way cancels out
+                flow.remove((node, parent))
+            else:
+                flow.add((parent, node))
+            node = parent
+    return None
+
+
+def part1(puzzle: str, wires: int = 3) -> int:
+    """Cut the wires splitting the components in two, multiply the group sizes
+
+    Any component will do as one end: the first one from the other group
+    is parted from it by exactly the cut we want.
+    """
     graph = parse_input(puzzle=puzzle)
-    rendered = graph_to_dot(graph=graph)
-    dotfile = Path(f'day25{"test" if puzzle == TEST_INPUT else ""}.dot')
-    dotfile.write_text(rendered)
-    print(f'Now run neato -Tsvg {dotfile.name} > {dotfile.name.replace("dot", "svg")}')
-    print("then look at the graph to find the critical links")
-    print("Come back here and edit the code to replace the definitions of the three")
-    print("edges below")
-    edge1 = ("bff", "rhk")
-    edge2 = ("qpp", "vnm")
-    edge3 = ("kfr", "vkp")
-    iterable = graph.edges if puzzle == TEST_INPUT else [edge1, edge2, edge3]
-    for edge1, edge2, edge3 in combinations(iterable, 3):
-        new_graph = graph.copy()
-        new_graph.remove_edge(*edge1)
-        new_graph.remove_edge(*edge2)
-        new_graph.remove_edge(*edge3)
-        sets_seen = set()
-        for node in new_graph.nodes:
-            neighbors = tuple(
-                sorted(networkx.node_connected_component(new_graph, node))
-            )
-            sets_seen.add(neighbors)
-        # print(f"removed {edge1}, {edge2}, {edge3}; got {[len(i) for i in sets_seen]}")
-        if len(sets_seen) == 2:
-            a, b = list(sets_seen)
-            print(f"removed {edge1}, {edge2}, {edge3} and got {len(a)} and {len(b)}")
-            return len(a) * len(b)
-    raise ValueError("did not work")
+    source, *others = graph
+    for sink in others:
+        if (side := source_side(graph, source, sink, wires)) is not None:
+            return len(side) * (len(graph) - len(side))
+    raise ValueError(f"no {wires} wires split the components in two")
 
 
 def main():
+    real_input = load_input(25)
     part_1_result = part1(TEST_INPUT)
     assert part_1_result == 54, part_1_result
-    print(part1(REAL_INPUT))
+    print(part1(real_input))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,567 @@
+"""Seeded generators for bigger-than-real puzzle inputs
+
+Each generator takes a size knob (roughly "how many lines" or "how wide is the
+grid") and a seed, and always gives back the same puzzle text for the same
+arguments, so timings at different sizes can be compared run to run.
+"""
+
+import random
+import string
+from collections import deque
+from typing import Callable
+
+
+def _grid(size: int, rng: random.Random, choices: str, weights: list[int]) -> str:
+    return "\n".join(
+        "".join(rng.choices(choices, weights=weights, k=size)) for _ in range(size)
+    )
+
+
+def _names(count: int, rng: random.Random, alphabet: str = "") -> list[str]:
+    """Unique random names (at least 3 characters), e.g. for graph nodes"""
+    alphabet = alphabet or string.ascii_lowercase
+    length = 3
+    while len(alphabet) ** length < 2 * count:
+        length += 1
+    names: set[str] = set()
+    while len(names) < count:
+        names.add("".join(rng.choices(alphabet, k=length)))
+    return rng.sample(sorted(names), count)
+
+
+def day01(size: int, seed: int = 0) -> str:
+    """calibration lines with letters, digits and spelled-out digits"""
+    rng = random.Random(seed)
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    lines = []
+    for _ in range(size):
+        chunks = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 6)):
+            match rng.randint(0, 2):
+                case 0:
+                    chunks.append(str(rng.randint(1, 9)))
+                case 1:
+                    chunks.append(rng.choice(words))
+                case _:
+                    chunks.append("".join(rng.choices(string.ascii_lowercase, k=3)))
+        rng.shuffle(chunks)
+        lines.append("".join(chunks))
+    return "\n".join(lines)
+
+
+def day02(size: int, seed: int = 0) -> str:
+    """cube games"""
+    rng = random.Random(seed)
+    lines = []
+    for game in range(1, size + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game}: {'; '.join(draws)}")
+    return "\n".join(lines)
+
+
+def day03(size: int, seed: int = 0) -> str:
+    """engine schematic: numbers, symbols (plenty of gears) and dots"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        row = []
+        while len(row) < size:
+            roll = rng.random()
+            if roll < 0.15:
+                row.extend(str(rng.randint(1, 999)))
+                row.append(".")
+            elif roll < 0.22:
+                row.append(rng.choice("*****#+$/=%@&-"))
+            else:
+                row.append(".")
+        rows.append("".join(row[:size]))
+    return "\n".join(rows)
+
+
+def day04(size: int, seed: int = 0) -> str:
+    """scratch cards"""
+    rng = random.Random(seed)
+    lines = []
+    for card in range(1, size + 1):
+        winners = rng.sample(range(1, 100), 10)
+        numbers = rng.sample(range(1, 100), 25)
+        lines.append(
+            f"Card {card:4}: {' '.join(f'{i:2}' for i in winners)}"
+            f" | {' '.join(f'{i:2}' for i in numbers)}"
+        )
+    return "\n".join(lines)
+
+
+def day05(size: int, seed: int = 0) -> str:
+    """almanac: `size` seed ranges and `size` ranges per map"""
+    rng = random.Random(seed)
+    limit = 2**32
+    seeds = []
+    for _ in range(size):
+        start = rng.randrange(limit // 2)
+        seeds.extend([start, rng.randint(1, limit // (4 * size))])
+    groups = [f"seeds: {' '.join(str(i) for i in seeds)}"]
+    names = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    for source, dest in zip(names, names[1:]):
+        # carve the number line into pieces and shuffle where they land
+        cuts = sorted(rng.sample(range(1, limit), size))
+        pieces = list(zip([0] + cuts, cuts))
+        rng.shuffle(pieces)
+        lines = [f"{source}-to-{dest} map:"]
+        position = 0
+        for start, end in pieces:
+            lines.append(f"{position} {start} {end - start}")
+            position += end - start
+        groups.append("\n".join(lines))
+    return "\n\n".join(groups)
+
+
+def day06(size: int, seed: int = 0) -> str:
+    """boat races"""
+    rng = random.Random(seed)
+    times = [rng.randint(10, 99) for _ in range(size)]
+    distances = [rng.randint(1, time * time // 4 - 1) for time in times]
+    return (
+        f"Time:     {' '.join(f'{i:4}' for i in times)}\n"
+        f"Distance: {' '.join(f'{i:4}' for i in distances)}"
+    )
+
+
+def day07(size: int, seed: int = 0) -> str:
+    """camel cards hands and bids"""
+    rng = random.Random(seed)
+    return "\n".join(
+        f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}"
+        for _ in range(size)
+    )
+
+
+def day08(size: int, seed: int = 0, ghosts: int = 6) -> str:
+    """network of `ghosts` loops, each roughly `size` nodes long
+
+    The first ghost walks from AAA to ZZZ so part 1 works too.
+    """
+    rng = random.Random(seed)
+    # keep A and Z for the starts and ends
+    alphabet = "BCDEFGHIJKLMNOPQRSTUVWXY"
+    instructions = "".join(rng.choices("LR", k=max(size // 4, 2)))
+    lines = []
+    names = iter(_names(2 * ghosts * size, rng, alphabet=alphabet))
+    for ghost in range(ghosts):
+        length = size + rng.randint(0, size // 2)
+        start = "AAA" if not ghost else next(names) + "A"
+        end = "ZZZ" if not ghost else next(names) + "Z"
+        loop = [next(names) for _ in range(length)] + [end]
+        # the start feeds into the loop, and the end goes back around
+        lines.append(f"{start} = ({loop[0]}, {loop[0]})")
+        for node, next_node in zip(loop, loop[1:] + loop[:1]):
+            lines.append(f"{node} = ({next_node}, {next_node})")
+    rng.shuffle(lines)
+    return f"{instructions}\n\n" + "\n".join(lines)
+
+
+def day09(size: int, seed: int = 0, length: int = 21) -> str:
+    """sensor histories, each a low degree polynomial"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        lines.append(
+            " ".join(
+                str(sum(c * x**power for power, c in enumerate(coefficients)))
+                for x in range(length)
+            )
+        )
+    return "\n".join(lines)
+
+
+def day10(size: int, seed: int = 0) -> str:
+    """a rectangular pipe loop (S is its bottom right J) surrounded by junk"""
+    rng = random.Random(seed)
+    rows = [rng.choices("|-LJ7F.", k=size) for _ in range(size)]
+    # keep a ring of ground around the loop so nothing outside connects to S
+    for index in range(size):
+        rows[0][index] = rows[-1][index] = rows[index][0] = rows[index][-1] = "."
+    low, high = 1, size - 2
+    for x in range(low, high + 1):
+        rows[low][x] = rows[high][x] = "-"
+    for y in range(low, high + 1):
+        rows[y][low] = rows[y][high] = "|"
+    rows[low][low] = "F"
+    rows[low][high] = "7"
+    rows[high][low] = "L"
+    rows[high][high] = "S"
+    return "\n".join("".join(row) for row in rows)
+
+
+def day11(size: int, seed: int = 0) -> str:
+    """galaxies in a size x size image"""
+    rng = random.Random(seed)
+    rows = _grid(size, rng, ".#", [60, 1]).splitlines()
+    # make sure there's something to expand
+    blank_row = rng.randrange(size)
+    blank_column = rng.randrange(size)
+    rows[blank_row] = "." * size
+    return "\n".join(row[:blank_column] + "." + row[blank_column + 1 :] for row in rows)
+
+
+def day12(size: int, seed: int = 0, length: int = 20) -> str:
+    """spring records: a random valid row with some spots unknown"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        springs = rng.choices(".#", k=length)
+        if "#" not in springs:
+            springs[rng.randrange(length)] = "#"
+        groups = [len(group) for group in "".join(springs).split(".") if group]
+        record = "".join("?" if rng.random() < 0.4 else spring for spring in springs)
+        lines.append(f"{record} {','.join(str(i) for i in groups)}")
+    return "\n".join(lines)
+
+
+def _mirror_axes(rows: list[list[str]], differences: int) -> int:
+    """How many row or column mirrors are off by exactly `differences` spots"""
+    found = 0
+    for lines in (rows, list(zip(*rows))):
+        for axis in range(1, len(lines)):
+            mismatches = sum(
+                first != second
+                for offset in range(min(axis, len(lines) - axis))
+                for first, second in zip(lines[axis - offset - 1], lines[axis + offset])
+            )
+            found += mismatches == differences
+    return found
+
+
+def _mirror_pattern(rng: random.Random) -> list[list[str]]:
+    """A pattern with a row mirror and a column mirror that's one spot out
+
+    The pattern is made symmetric about a row axis and a column axis, then one
+    spot outside the row mirror's reach is flipped, so the row mirror stays
+    exact and the column mirror is left with a single difference.
+    """
+    height = rng.randint(7, 17)
+    width = rng.randint(5, 17)
+    row_axis = rng.choice([i for i in range(1, height) if 2 * i != height])
+    column_axis = rng.randint(1, width - 1)
+    rows = [rng.choices(".#", k=width) for _ in range(height)]
+    reach = min(column_axis, width - column_axis)
+    for row in rows:
+        for offset in range(reach):
+            row[column_axis + offset] = row[column_axis - offset - 1]
+    row_reach = min(row_axis, height - row_axis)
+    for offset in range(row_reach):
+        rows[row_axis + offset] = rows[row_axis - offset - 1][:]
+    y = rng.choice([*range(row_axis - row_reach), *range(row_axis + row_reach, height)])
+    x = rng.randrange(column_axis - reach, column_axis + reach)
+    rows[y][x] = "#" if rows[y][x] == "." else "."
+    return rows
+
+
+def day13(size: int, seed: int = 0) -> str:
+    """`size` patterns, each with exactly one exact mirror and one smudged one
+
+    The random parts of a pattern can line up into more mirrors by chance,
+    so those patterns get thrown away and made again.
+    """
+    rng = random.Random(seed)
+    patterns = []
+    while len(patterns) < size:
+        rows = _mirror_pattern(rng)
+        if _mirror_axes(rows, 0) != 1 or _mirror_axes(rows, 1) != 1:
+            continue
+        if rng.random() < 0.5:
+            # the other way round: an exact column mirror, smudged row mirror
+            rows = [list(column) for column in zip(*rows)]
+        patterns.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(patterns)
+
+
+def day14(size: int, seed: int = 0) -> str:
+    """rolling rocks platform"""
+    return _grid(size, random.Random(seed), ".O#", [6, 3, 2])
+
+
+def day15(size: int, seed: int = 0) -> str:
+    """initialization sequence with `size` steps"""
+    rng = random.Random(seed)
+    labels = _names(max(size // 10, 1), rng)
+    steps = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        if rng.random() < 0.3:
+            steps.append(f"{label}-")
+        else:
+            steps.append(f"{label}={rng.randint(1, 9)}")
+    return ",".join(steps)
+
+
+def day16(size: int, seed: int = 0) -> str:
+    """mirror and splitter contraption"""
+    return _grid(size, random.Random(seed), ".|-/\\", [40, 2, 2, 2, 2])
+
+
+def day17(size: int, seed: int = 0) -> str:
+    """heat loss map"""
+    return _grid(size, random.Random(seed), "123456789", [1] * 9)
+
+
+def day18(size: int, seed: int = 0) -> str:
+    """dig plan tracing a random (non-self-intersecting) skyline shape
+
+    The colours encode the same moves so both parts dig the same hole.
+    """
+    rng = random.Random(seed)
+    widths = [rng.randint(1, 20) for _ in range(size)]
+    middle = 100
+    tops = [rng.randint(middle + 1, 2 * middle) for _ in range(size)]
+    bottoms = [rng.randint(0, middle - 1) for _ in range(size)]
+    moves = [("U", tops[0] - bottoms[0])]
+    for index, width in enumerate(widths):
+        moves.append(("R", width))
+        if index + 1 < size:
+            delta = tops[index + 1] - tops[index]
+            if delta:
+                moves.append(("U" if delta > 0 else "D", abs(delta)))
+    moves.append(("D", tops[-1] - bottoms[-1]))
+    for index in range(size - 1, -1, -1):
+        moves.append(("L", widths[index]))
+        if index:
+            delta = bottoms[index - 1] - bottoms[index]
+            if delta:
+                moves.append(("U" if delta > 0 else "D", abs(delta)))
+    codes = {"R": 0, "D": 1, "L": 2, "U": 3}
+    return "\n".join(
+        f"{direction} {amount} (#{amount:05x}{codes[direction]})"
+        for direction, amount in moves
+    )
+
+
+def day19(size: int, seed: int = 0, parts: int = 200) -> str:
+    """a tree of `size` workflows plus some parts to sort"""
+    rng = random.Random(seed)
+    names = ["in"] + _names(size - 1, rng)
+    # hand out names in order so a workflow only ever sends parts further down
+    pending = deque(names[1:])
+    flows = []
+    for name in names:
+        conditions = []
+        for _ in range(rng.randint(1, 3)):
+            attr = rng.choice("xmas")
+            comparison = rng.choice("<>")
+            if pending and rng.random() < 0.7:
+                destination = pending.popleft()
+            else:
+                destination = rng.choice("AR")
+            conditions.append(f"{attr}{comparison}{rng.randint(1, 4000)}:{destination}")
+        conditions.append(pending.popleft() if pending else rng.choice("AR"))
+        flows.append(f"{name}{{{','.join(conditions)}}}")
+    rng.shuffle(flows)
+    part_lines = [
+        "{" + ",".join(f"{attr}={rng.randint(1, 4000)}" for attr in "xmas") + "}"
+        for _ in range(parts)
+    ]
+    return "\n".join(flows) + "\n\n" + "\n".join(part_lines)
+
+
+def day20(size: int, seed: int = 0, bits: int = 12) -> str:
+    """`size` counters of flip-flops, like the real input, feeding rx
+
+    Each counter is a chain of flip-flops counting button presses in binary.
+    Its conjunction hears from the bits that are set in the counter's period
+    and, once they all are, pulses the unset bits and the lowest one, which
+    carries the count round to 0. The hubs each go through an inverter into
+    the conjunction in front of rx, so part 2 is the LCM of the periods.
+    """
+    rng = random.Random(seed)
+    names = _names(size * (bits + 2) + 1, rng)
+    final = names.pop()
+    broadcast = []
+    lines = [f"&{final} -> rx"]
+    for _ in range(size):
+        chain = [names.pop() for _ in range(bits)]
+        hub = names.pop()
+        inverter = names.pop()
+        # odd, with the top bit set, so every bit has a job
+        period = rng.randrange(1 << (bits - 1), 1 << bits) | 1
+        broadcast.append(chain[0])
+        hub_outputs = [chain[0]]
+        for index, flip_flop in enumerate(chain):
+            outputs = chain[index + 1 : index + 2]
+            if period >> index & 1:
+                outputs.append(hub)
+            elif index:
+                hub_outputs.append(flip_flop)
+            lines.append(f"%{flip_flop} -> {', '.join(outputs)}")
+        lines.append(f"&{hub} -> {', '.join(hub_outputs + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"broadcaster -> {', '.join(broadcast)}")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day21(size: int, seed: int = 0) -> str:
+    """garden with S in the middle and clear lanes through it (size is odd)"""
+    rng = random.Random(seed)
+    size |= 1
+    rows = [rng.choices(".#", weights=[6, 1], k=size) for _ in range(size)]
+    middle = size // 2
+    for index in range(size):
+        rows[middle][index] = rows[index][middle] = "."
+        rows[0][index] = rows[-1][index] = rows[index][0] = rows[index][-1] = "."
+    rows[middle][middle] = "S"
+    return "\n".join("".join(row) for row in rows)
+
+
+def day22(size: int, seed: int = 0, footprint: int = 10) -> str:
+    """`size` bricks stacked up without overlapping"""
+    rng = random.Random(seed)
+    lines = []
+    z = 1
+    for _ in range(size):
+        x = rng.randrange(footprint)
+        y = rng.randrange(footprint)
+        length = rng.randint(0, 3)
+        match rng.randint(0, 2):
+            case 0:
+                x2 = min(x + length, footprint - 1)
+                lines.append(f"{x},{y},{z}~{x2},{y},{z}")
+                z += 1
+            case 1:
+                y2 = min(y + length, footprint - 1)
+                lines.append(f"{x},{y},{z}~{x},{y2},{z}")
+                z += 1
+            case _:
+                lines.append(f"{x},{y},{z}~{x},{y},{z + length}")
+                z += length + 1
+        z += rng.randint(0, 2)
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def day23(size: int, seed: int = 0, loops: int | None = None) -> str:
+    """hiking maze with `loops` extra openings and downhill slopes at junctions
+
+    size is the width and height of the maze in characters (made odd).
+    """
+    rng = random.Random(seed)
+    size |= 1
+    cells = size // 2
+    loops = cells if loops is None else loops
+    grid = [["#"] * size for _ in range(size)]
+    # carve a perfect maze on the odd coordinates
+    stack = [(1, 1)]
+    grid[1][1] = "."
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy, dx, dy)
+            for dx, dy in [(2, 0), (-2, 0), (0, 2), (0, -2)]
+            if 0 < x + dx < size - 1
+            and 0 < y + dy < size - 1
+            and grid[y + dy][x + dx] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        x1, y1, dx, dy = rng.choice(options)
+        grid[y + dy // 2][x + dx // 2] = "."
+        grid[y1][x1] = "."
+        stack.append((x1, y1))
+    # knock out some more walls so there's more than one way through
+    for _ in range(loops):
+        x = rng.randrange(1, size - 1)
+        y = rng.randrange(1, size - 1)
+        if (x + y) % 2 and grid[y][x] == "#":
+            grid[y][x] = "."
+    grid[0][1] = "."
+    grid[-1][-2] = "."
+    # put slopes next to every junction, pointing away from the start
+    distances = {(1, 0): 0}
+    queue = [(1, 0)]
+    for x, y in queue:
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            if 0 <= y + dy < size and grid[y + dy][x + dx] != "#":
+                if (x + dx, y + dy) not in distances:
+                    distances[x + dx, y + dy] = distances[x, y] + 1
+                    queue.append((x + dx, y + dy))
+    arrows = {(1, 0): ">", (-1, 0): "<", (0, 1): "v", (0, -1): "^"}
+    for (x, y), distance in distances.items():
+        neighbors = [
+            (dx, dy)
+            for dx, dy in arrows
+            if 0 <= y + dy < size and grid[y + dy][x + dx] != "#"
+        ]
+        if len(neighbors) < 3:
+            continue
+        for dx, dy in neighbors:
+            if grid[y + dy][x + dx] != "." or (x + dx, y + dy) in [
+                (1, 0),
+                (size - 2, size - 1),
+            ]:
+                continue
+            if distances[x + dx, y + dy] > distance:
+                grid[y + dy][x + dx] = arrows[dx, dy]
+            else:
+                grid[y + dy][x + dx] = arrows[-dx, -dy]
+    return "\n".join("".join(row) for row in grid)
+
+
+def day24(size: int, seed: int = 0) -> str:
+    """hailstones that a single thrown rock will hit"""
+    rng = random.Random(seed)
+    rock = [rng.randint(-1000, 1000) for _ in range(3)]
+    rock_velocity = [rng.randint(-100, 100) for _ in range(3)]
+    lines = []
+    for _ in range(size):
+        time = rng.randint(1, 1000)
+        velocity = [rng.randint(-200, 200) for _ in range(3)]
+        position = [
+            p + time * (rv - v) for p, rv, v in zip(rock, rock_velocity, velocity)
+        ]
+        lines.append(
+            f"{', '.join(str(i) for i in position)} @ {', '.join(str(i) for i in velocity)}"
+        )
+    return "\n".join(lines)
+
+
+def day25(size: int, seed: int = 0) -> str:
+    """two dense clusters of about `size` components joined by 3 wires"""
+    rng = random.Random(seed)
+    # the first 5 of a cluster are all wired together, so it takes 4 cuts to
+    # split a cluster and the 3 wires between them are the only answer
+    size = max(size, 5)
+    names = _names(2 * size, rng)
+    clusters = [names[:size], names[size:]]
+    connections: dict[str, set[str]] = {name: set() for name in names}
+    for cluster in clusters:
+        for index, name in enumerate(cluster[1:], start=1):
+            # keep every cluster connected, then add a few extra wires
+            for other in rng.sample(cluster[:index], min(index, 4)):
+                connections[name].add(other)
+    for left, right in zip(rng.sample(clusters[0], 3), rng.sample(clusters[1], 3)):
+        connections[left].add(right)
+    return "\n".join(
+        f"{name}: {' '.join(sorted(targets))}"
+        for name, targets in connections.items()
+        if targets
+    )
+
+
+GENERATORS: dict[int, Callable[..., str]] = {
+    int(name[3:]): func
+    for name, func in list(globals().items())
+    if name.startswith("day") and callable(func)
+}
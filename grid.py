@@ -0,0 +1,121 @@
+"""A compact 2D grid for the map-style puzzles
+
+Cells live in one flat bytearray with a row stride, so a lookup is a bit of
+arithmetic and an index instead of hashing a tuple, and rows and columns can
+be handed out as memoryviews without copying anything.
+"""
+
+from typing import Iterator, Self
+
+ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# for grids of single digits (e.g. day 17's heat loss map)
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+class Grid:
+    """width x height cells of one byte each
+
+    By default, anything off the edge of the grid is out of bounds. With
+    wrap=True the grid repeats forever in every direction (day 21's
+    infinite garden).
+    """
+
+    def __init__(self, width: int, height: int, data: bytearray, wrap: bool = False):
+        if len(data) != width * height:
+            raise ValueError(f"expected {width * height} cells, got {len(data)}")
+        self.width = width
+        self.height = height
+        self.data = data
+        self.wrap = wrap
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        wrap: bool = False,
+        table: bytes | None = None,
+    ) -> Self:
+        """Build a grid from the puzzle text
+
+        table is an optional bytes.translate() table, e.g. DIGITS to store
+        the value of each digit rather than its character.
+        """
+        lines = text.splitlines()
+        width = len(lines[0])
+        if any(len(line) != width for line in lines):
+            raise ValueError("all rows must be the same width")
+        data = bytearray("".join(lines), "ascii")
+        if table is not None:
+            data = data.translate(table)
+        return cls(width, len(lines), data, wrap=wrap)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return self.wrap or (0 <= x < self.width and 0 <= y < self.height)
+
+    def index(self, x: int, y: int) -> int:
+        """Where (x, y) lives in the flat data"""
+        if self.wrap:
+            return (y % self.height) * self.width + x % self.width
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{x, y} is off the grid")
+        return y * self.width + x
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        return self.data[self.index(*position)]
+
+    def __setitem__(self, position: tuple[int, int], value: int):
+        self.data[self.index(*position)] = value
+
+    def get(self, x: int, y: int, default: int | None = None) -> int | None:
+        """Like dict.get: the cell's value, or the default when off the grid"""
+        if not self.in_bounds(x, y):
+            return default
+        return self.data[self.index(x, y)]
+
+    def neighbors(
+        self,
+        x: int,
+        y: int,
+        diagonal: bool = False,
+    ) -> Iterator[tuple[int, int]]:
+        """All the on-grid (or wrapped) positions next to (x, y)"""
+        for dx, dy in ORTHOGONAL + DIAGONAL if diagonal else ORTHOGONAL:
+            if self.in_bounds(x + dx, y + dy):
+                yield x + dx, y + dy
+
+    def row(self, y: int) -> memoryview:
+        """A view of row y (no copying)"""
+        if self.wrap:
+            y %= self.height
+        start = y * self.width
+        return memoryview(self.data)[start : start + self.width]
+
+    def column(self, x: int) -> memoryview:
+        """A view of column x (no copying)"""
+        if self.wrap:
+            x %= self.width
+        return memoryview(self.data)[x :: self.width]
+
+    def find(self, value: int) -> tuple[int, int]:
+        """Coordinates of the first cell holding value"""
+        y, x = divmod(self.data.index(value), self.width)
+        return x, y
+
+    def positions(self, value: int) -> Iterator[tuple[int, int]]:
+        """Coordinates of every cell holding value, in reading order"""
+        index = self.data.find(value)
+        while index != -1:
+            y, x = divmod(index, self.width)
+            yield x, y
+            index = self.data.find(value, index + 1)
+
+    def copy(self) -> Self:
+        return self.__class__(self.width, self.height, self.data[:], wrap=self.wrap)
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.data[start : start + self.width].decode("ascii")
+            for start in range(0, len(self.data), self.width)
+        )
@@ -0,0 +1,63 @@
+"""Lazy loading of the real puzzle inputs
+
+Nothing reads dayXX.txt at import time: each day's main() (or the runner)
+asks for its input when it actually needs it, and the result is remembered
+so asking twice doesn't hit the disk twice.
+
+The days that work a line at a time can also take their input as a stream
+(see iter_lines), e.g. straight from open_input() for inputs too big to want
+in memory.
+"""
+
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from functools import cache
+from pathlib import Path
+from typing import TextIO
+
+# anything bigger than this gets mapped rather than read in one go
+MMAP_THRESHOLD = 1 << 20
+
+
+def input_path(day: int) -> Path:
+    """Where the real input for the day lives"""
+    return Path(f"day{day:02}.txt")
+
+
+@cache
+def load_input(day: int) -> str:
+    """Read the real input for the day, only once"""
+    with input_path(day).open("rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return f.read().decode()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # decode straight out of the mapping without an extra bytes copy
+            return str(mapped, "utf-8")
+
+
+def open_input(day: int) -> TextIO:
+    """Open the real input for the day, for reading it a line at a time"""
+    return input_path(day).open()
+
+
+def iter_lines(puzzle: str | Iterable[str] | Iterable[bytes]) -> Iterator[str]:
+    """The lines of the puzzle one by one, without their line endings
+
+    puzzle can be the whole thing as a string, or anything that gives lines:
+    a list, a generator, or an open file (which Python reads a buffer at a
+    time, so it's never all in memory at once).
+    """
+    if isinstance(puzzle, str):
+        # like splitlines(), but without making every line up front
+        start = 0
+        while (end := puzzle.find("\n", start)) != -1:
+            yield puzzle[start:end].rstrip("\r")
+            start = end + 1
+        if start < len(puzzle):
+            yield puzzle[start:]
+        return
+    for line in puzzle:
+        if isinstance(line, bytes):
+            line = line.decode()
+        yield line.rstrip("\r\n")
@@ -0,0 +1,104 @@
+"""Spreading the line-at-a-time days across processes
+
+Lots of days score every line on its own and add the scores up, so the input
+can be cut into chunks (always at the end of a line), each chunk scored in a
+separate process with the day's usual function, and the chunk scores added
+back together.
+
+    map_reduce(day01.part2, puzzle, workers=8)
+    map_reduce(day01.part2, Path("day01.txt"), workers=8)
+
+Given a path, the workers each read their own byte range of the file, so
+the input is never sent between processes.
+"""
+
+import mmap
+import operator
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def chunk_bounds(
+    data: str | bytes | mmap.mmap,
+    count: int,
+    separator: str = "\n",
+) -> list[tuple[int, int]]:
+    """Cut data into about count (start, end) ranges that end on a separator
+
+    The separator is a newline by default, or e.g. a blank line ("\n\n")
+    for puzzles made of blocks of lines.
+    """
+    newline = separator if isinstance(data, str) else separator.encode()
+    size = len(data)
+    bounds = []
+    start = 0
+    for index in range(1, count + 1):
+        if start >= size:
+            break
+        target = size * index // count
+        if target <= start:
+            continue
+        end = data.find(newline, max(target - len(newline), start))
+        end = size if end == -1 or index == count else end + len(newline)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def add_elementwise(first: tuple, second: tuple) -> tuple:
+    """combine for functions that score several things at once"""
+    return tuple(map(operator.add, first, second))
+
+
+def _score_file(func: Callable[[str], T], path: Path, start: int, end: int) -> T:
+    with path.open("rb") as f:
+        f.seek(start)
+        return func(f.read(end - start).decode())
+
+
+def map_reduce(
+    func: Callable[[str], T],
+    puzzle: str | os.PathLike,
+    workers: int | None = None,
+    combine: Callable[[T, T], T] = operator.add,
+    chunks: int | None = None,
+    separator: str = "\n",
+) -> T:
+    """func(puzzle), worked out a chunk of lines at a time in parallel
+
+    func gets a chunk of whole lines as a string, and has to be something
+    that can be pickled (a module-level function, or a partial of one).
+    combine puts two chunks' results together. By default the input is cut
+    into 4 chunks per worker, so a slow chunk doesn't hold everything up.
+    Chunks only ever end straight after a separator.
+    """
+    workers = workers or os.cpu_count()
+    chunks = chunks or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if isinstance(puzzle, str):
+            futures = [
+                pool.submit(func, puzzle[start:end])
+                for start, end in chunk_bounds(puzzle, chunks, separator)
+            ]
+        elif isinstance(puzzle, os.PathLike):
+            path = Path(puzzle)
+            with path.open("rb") as f:
+                if not os.fstat(f.fileno()).st_size:
+                    return func("")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    bounds = chunk_bounds(mapped, chunks, separator)
+            futures = [
+                pool.submit(_score_file, func, path, start, end)
+                for start, end in bounds
+            ]
+        else:
+            raise TypeError(f"can't split up a {puzzle.__class__.__name__}")
+        if not futures:
+            return func("")
+        return reduce(combine, (future.result() for future in futures))
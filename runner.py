@@ -0,0 +1,145 @@
+"""Run every day's solutions at once
+
+Each part runs in its own worker process, so a full pass takes about as long
+as the slowest part instead of the sum of all of them.
+
+    pipenv run python runner.py          # every day with an input file
+    pipenv run python runner.py 16 19    # just those days
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter, process_time
+
+from inputs import input_path, load_input
+
+DAY_MODULE = re.compile(r"^day(\d\d)\.py$")
+
+# parts that aren't a plain part1(puzzle) / part2(puzzle):
+# part name -> (function name, extra positional args)
+SPECIAL_PARTS: dict[int, dict[str, tuple[str, tuple]]] = {
+    7: {"part1": ("part1", ()), "part2": ("part1", (True,))},
+    9: {"part1": ("part1", ()), "part2": ("part1", (True,))},
+    # these solve both parts in one go
+    13: {"both": ("run_puzzle", ())},
+    22: {"both": ("part1", ())},
+}
+
+# days whose real input needs a little cleanup first
+PREPARE_INPUT = {
+    15: lambda puzzle: puzzle.replace("\n", ""),
+}
+
+
+@dataclass
+class PartResult:
+    day: int
+    part: str
+    answer: object
+    wall_time: float
+    cpu_time: float
+    error: str | None = None
+
+    def __str__(self) -> str:
+        answer = f"error: {self.error}" if self.error else self.answer
+        return (
+            f"day {self.day:2} {self.part:>5}: {answer}"
+            f" (wall {self.wall_time:.3f}s, cpu {self.cpu_time:.3f}s)"
+        )
+
+
+def available_days() -> list[int]:
+    """Find every dayXX.py next to this file"""
+    days = []
+    for path in Path(__file__).parent.iterdir():
+        if match := DAY_MODULE.match(path.name):
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def parts_for_day(day: int) -> dict[str, tuple[str, tuple]]:
+    """Find the functions to call for each part of the day"""
+    try:
+        return SPECIAL_PARTS[day]
+    except KeyError:
+        pass
+    module = importlib.import_module(f"day{day:02}")
+    return {part: (part, ()) for part in ("part1", "part2") if hasattr(module, part)}
+
+
+def quietly() -> contextlib.AbstractContextManager:
+    """The days are chatty, this keeps their progress output out of reports"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def run_part(day: int, part: str, func_name: str, args: tuple) -> PartResult:
+    """Solve a single part (meant to be run in a worker process)"""
+    wall_start = perf_counter()
+    cpu_start = process_time()
+    answer = None
+    error = None
+    try:
+        module = importlib.import_module(f"day{day:02}")
+        puzzle = load_input(day)
+        if day in PREPARE_INPUT:
+            puzzle = PREPARE_INPUT[day](puzzle)
+        with quietly():
+            answer = getattr(module, func_name)(puzzle, *args)
+    except Exception as exc:
+        error = f"{exc.__class__.__name__}: {exc}"
+    return PartResult(
+        day=day,
+        part=part,
+        answer=answer,
+        wall_time=perf_counter() - wall_start,
+        cpu_time=process_time() - cpu_start,
+        error=error,
+    )
+
+
+def run_days(days: list[int], workers: int | None = None) -> list[PartResult]:
+    """Run every part of the given days in parallel"""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for day in days:
+            try:
+                parts = parts_for_day(day)
+            except Exception as exc:
+                results.append(
+                    PartResult(day, "-", None, 0, 0, f"{exc.__class__.__name__}: {exc}")
+                )
+                continue
+            for part, (func_name, args) in parts.items():
+                futures.append(pool.submit(run_part, day, part, func_name, args))
+        for future in as_completed(futures):
+            result = future.result()
+            print(result)
+            results.append(result)
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-j", "--workers", type=int, help="number of worker processes")
+    args = parser.parse_args()
+    days = args.days or [day for day in available_days() if input_path(day).exists()]
+    start = perf_counter()
+    results = run_days(days, workers=args.workers)
+    elapsed = perf_counter() - start
+    print("---")
+    for result in results:
+        print(result)
+    total_cpu = sum(result.cpu_time for result in results)
+    print(f"{len(results)} parts in {elapsed:.3f}s wall ({total_cpu:.3f}s cpu)")
+
+
+if __name__ == "__main__":
+    main()